@@ -1,9 +1,40 @@
+import json
 import math
+import os
+import state_key
+
+HEURISTIC_WEIGHTS_FILE = "heuristic_weights.json" # Weights fitted offline by tune_heuristic.py
+# Hand-set weights of the static evaluator, one per feature returned by GameState.features()
+STATIC_WEIGHTS = {'score_diff': 200.0, 'score_diff_per_ply': 50.0, 'next_point': 100.0, 'last_move': -300.0}
+EVALUATION_LIMIT = 999.0 # Estimates stay strictly inside the +-1000 band of proven wins/losses
+_weights_by_mode = {} # Lazily loaded weights per evaluation mode
+ALGORITHMS = ('minimax', 'alphabeta', 'outcome', 'expectimax', 'auto') # Names accepted by search()
+
+
+def get_heuristic_weights(mode='static'):
+    """
+    Returns the feature weights for an evaluation mode.
+    'static' uses STATIC_WEIGHTS; 'tuned' loads HEURISTIC_WEIGHTS_FILE once and falls back
+    to the static weights if the file is missing or invalid.
+    """
+    if mode not in _weights_by_mode:
+        weights = STATIC_WEIGHTS
+        if mode == 'tuned':
+            try:
+                with open(HEURISTIC_WEIGHTS_FILE, 'r') as f:
+                    fitted = json.load(f)['weights']
+                weights = {name: float(fitted.get(name, 0.0)) for name in STATIC_WEIGHTS}
+            except (IOError, json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError) as e:
+                if os.path.exists(HEURISTIC_WEIGHTS_FILE):
+                    print(f"Error loading tuned weights from {HEURISTIC_WEIGHTS_FILE}: {e}. Using static weights.")
+        _weights_by_mode[mode] = weights
+    return _weights_by_mode[mode]
+
 
 class GameState:
     """Represents the state of the Number Division Game at a specific point."""
 
-    def __init__(self, n, cp, pp, b, turn, original_turn):
+    def __init__(self, n, cp, pp, b, turn, original_turn, key=None, remaining=None, pool=None):
         """
         Initialize a game state.
         n: Current number.
@@ -12,6 +43,9 @@ class GameState:
         b: Bank value.
         turn: Player whose turn it is (1 or 2).
         original_turn: Player who started the game (1 or 2).
+        key/remaining: Canonical state key and remaining-depth bound, passed in by create_child
+                       (computed from scratch when omitted).
+        pool: Optional StatePool; children already built elsewhere in the tree are reused.
         """
         self.n = n
         self.cp = cp
@@ -19,21 +53,32 @@ class GameState:
         self.b = b
         self.turn = turn
         self.original_turn = original_turn # Used for consistent heuristic evaluation
+        # Upper bound on the moves left; each move lowers it by exactly one
+        self.remaining = state_key.remaining_depth(n) if remaining is None else remaining
+        # Canonical 64-bit key shared by every cache/table (see state_key.canonical)
+        self.key = state_key.full_key(n, cp, pp, turn, original_turn, self.remaining) if key is None else key
 
-        # Generate potential child states (next possible moves)
-        # Division requires n > 3.
-        self.left = self.create_child(2) if n > 3 and n % 2 == 0 else None
-        self.right = self.create_child(3) if n > 3 and n % 3 == 0 else None
+        # A state is terminal if no further moves are possible (n <= 3 or not divisible by 2 or 3)
+        self._is_terminal = state_key.is_terminal_number(n)
 
-        # A state is terminal if no further moves are possible (n <= 3)
-        self._is_terminal = self.left is None and self.right is None
+        # Generate potential child states (next possible moves)
+        self._expand(pool)
 
         # Calculate the heuristic value ONLY if it's terminal.
         # Value for non-terminal states isn't needed for the base case here.
         self.h = self.heuristic() if self._is_terminal else 0 # Assign 0 or other placeholder if not terminal
 
-    def create_child(self, divisor):
-        """Generates a successor game state after dividing by the divisor."""
+    def _expand(self, pool):
+        """Materializes the children eagerly. Division requires n > 3."""
+        n = self.n
+        self.left = self.create_child(2, pool) if n > 3 and n % 2 == 0 else None
+        self.right = self.create_child(3, pool) if n > 3 and n % 3 == 0 else None
+
+    def create_child(self, divisor, pool=None):
+        """
+        Generates a successor game state after dividing by the divisor.
+        With a pool, an identical state built earlier is returned instead of a new subtree.
+        """
         new_n = self.n // divisor
         # Points awarded: +1 if the new number is even, -1 if odd
         pt = 1 if new_n % 2 == 0 else -1
@@ -55,7 +100,11 @@ class GameState:
         if not is_new_state_terminal:
              new_turn = 2 if self.turn == 1 else 1 # Switch turns
 
-        return GameState(new_n, new_cp, new_pp, new_b, new_turn, self.original_turn)
+        new_key = state_key.child_key(self, new_n, new_cp, new_pp, new_turn) # Incremental update
+        if pool is not None:
+            return pool.intern(new_n, new_cp, new_pp, new_b, new_turn, self.original_turn, new_key, self.remaining - 1)
+        # type(self) keeps streaming states streaming
+        return type(self)(new_n, new_cp, new_pp, new_b, new_turn, self.original_turn, new_key, self.remaining - 1)
 
     def terminal(self):
         """Returns true if this state is a terminal state (no more moves)."""
@@ -75,19 +124,155 @@ class GameState:
         elif score_diff < 0: return -1000.0 + score_diff # Loss for original starter
         else: return 0.0 # Draw
 
+    def features(self):
+        """
+        Static features of a NON-TERMINAL state, all from the original starter's perspective.
+        score_diff: Current score difference.
+        score_diff_per_ply: Score difference damped by the remaining 2/3-exponent depth
+                            (a lead matters more when few moves are left).
+        next_point: +1 if the player to move can reach an even number (and gain a point), else -1;
+                    negated when the opponent of the starter is to move.
+        last_move: +1 if the player to move is on track to make the last move
+                   (odd remaining depth), else -1; negated as above.
+        """
+        score_diff = (self.pp - self.cp) if self.original_turn == 1 else (self.cp - self.pp)
+        remaining = self.remaining # Upper bound on the moves left (2/3-exponent depth)
+        mover_sign = 1 if self.turn == self.original_turn else -1
+        # n/2 is even iff 4 | n; n/3 is even iff 2 | n (and the move needs 3 | n)
+        can_gain = self.n % 4 == 0 or (self.n % 3 == 0 and self.n % 2 == 0)
+        return {
+            'score_diff': score_diff,
+            'score_diff_per_ply': score_diff / (1 + remaining),
+            'next_point': mover_sign * (1 if can_gain else -1),
+            'last_move': mover_sign * (1 if remaining % 2 == 1 else -1),
+        }
+
+    def evaluate(self, mode='static'):
+        """
+        Value of the state for the original starter, usable at any depth.
+        Terminal states return the exact heuristic; other states a weighted feature estimate
+        clamped inside (-1000, 1000) so it never outranks a proven result.
+        """
+        if self._is_terminal:
+            return self.h
+        weights = get_heuristic_weights(mode)
+        estimate = sum(weights[name] * value for name, value in self.features().items())
+        return max(-EVALUATION_LIMIT, min(EVALUATION_LIMIT, estimate))
+
+
+class StreamingGameState(GameState):
+    """
+    A GameState that does not materialize its subtree: left/right are built on every access
+    and not kept, so a search holds only the current path in memory. Used when the eager
+    tree would exceed the memory budget.
+    """
+
+    def _expand(self, pool):
+        pass # Children are created on demand
+
+    @property
+    def left(self):
+        return self.create_child(2) if self.n > 3 and self.n % 2 == 0 else None
+
+    @property
+    def right(self):
+        return self.create_child(3) if self.n > 3 and self.n % 3 == 0 else None
+
+
+class StateBudgetExceeded(Exception):
+    """Raised by StatePool when materializing the tree would exceed its state budget."""
+
+
+class SearchBudget:
+    """
+    Node budget shared by one search. Once it is used up, every further node is scored with
+    the static evaluation instead of being expanded, so the search degrades to an estimate
+    instead of running (or allocating) without bound. Also used without a limit to report
+    progress of a running search.
+    """
+
+    def __init__(self, max_nodes=None, on_progress=None, progress_every=20_000):
+        """
+        max_nodes: Nodes expanded before cutting off (None = unlimited, only counts).
+        on_progress: Optional callback(nodes_used), called every `progress_every` nodes.
+        """
+        # The root is always expanded so a move is found
+        self.max_nodes = max(1, max_nodes) if max_nodes is not None else math.inf
+        self.used = 0
+        self.cutoffs = 0 # Nodes estimated because the budget was exhausted
+        self.on_progress = on_progress
+        self.progress_every = progress_every
+
+    def spend(self):
+        """Counts one node. Returns True if the node must be cut off."""
+        self.used += 1
+        if self.on_progress is not None and self.used % self.progress_every == 0:
+            self.on_progress(self.used)
+        if self.used > self.max_nodes:
+            self.cutoffs += 1
+            return True
+        return False
+
+    @property
+    def exhausted(self):
+        return self.cutoffs > 0
+
+
+class StatePool:
+    """
+    Interning pool for GameState nodes. Different divisor orders often reach the same state,
+    so sharing one node per distinct state turns the eager tree into a DAG. Searches and
+    Game.make_move only follow left/right, so they walk the DAG exactly like the tree.
+    """
+
+    def __init__(self, max_states=None):
+        """max_states: Raise StateBudgetExceeded instead of growing past this many states (None = no limit)."""
+        self._states = {} # (n, cp, pp, b, turn, original_turn) -> GameState
+        self.hits = 0     # Subtrees reused instead of rebuilt
+        self.max_states = max_states
+
+    def intern(self, n, cp, pp, b, turn, original_turn, key=None, remaining=None):
+        """Returns the pooled node for this exact state, building it (and its subtree) on first use."""
+        # The bank is part of the identity: it is shown in the UI even though the AI ignores it
+        identity = (n, cp, pp, b, turn, original_turn)
+        state = self._states.get(identity)
+        if state is None:
+            if self.max_states is not None and len(self._states) >= self.max_states:
+                raise StateBudgetExceeded(f"state pool limit of {self.max_states:,} reached at n={n}")
+            state = GameState(n, cp, pp, b, turn, original_turn, key, remaining, self)
+            self._states[identity] = state
+        else:
+            self.hits += 1
+        return state
+
+    def __len__(self):
+        return len(self._states)
 
-# --- Minimax Algorithm (Unlimited Depth) ---
-def minimax(state, maximizing):
+    def clear(self):
+        """Drops the pool's references; nodes still reachable from a live state survive."""
+        self._states.clear()
+
+
+# --- Minimax Algorithm ---
+def minimax(state, maximizing, depth=None, mode='static', budget=None, solutions=None):
     """
-    Performs the minimax search algorithm WITHOUT depth limit.
+    Performs the minimax search algorithm.
+    depth: Plies to search before falling back to GameState.evaluate(mode); None searches to the end.
+    budget: Optional SearchBudget; once spent, remaining nodes are estimated with evaluate(mode).
+    solutions: Optional dict; a full-depth search records canonical key -> (value, best_move_divisor)
+               of every non-terminal position it solves before the budget runs out, like solve_tree.
     Returns (best_value, best_move_divisor, nodes_explored).
-    WARNING: Can be extremely slow or run indefinitely for large N.
+    WARNING: Without a depth limit this can be extremely slow for large N.
     """
     nodes_explored = 1
-    # Base case: ONLY stop at actual terminal game states
+    # Base case: actual terminal game states
     if state.terminal():
         # Use the heuristic value calculated specifically for terminal states
         return (state.h, None, nodes_explored)
+    # Depth limit or node budget reached: estimate the position statically
+    if (depth is not None and depth <= 0) or (budget is not None and budget.spend()):
+        return (state.evaluate(mode), None, nodes_explored)
+    child_depth = None if depth is None else depth - 1
 
     # Get available moves
     moves = []
@@ -99,8 +284,7 @@ def minimax(state, maximizing):
     if maximizing:
         max_val = -math.inf
         for child, move in moves:
-            # Recursive call - NO depth parameter passed
-            child_val, _, child_nodes = minimax(child, False) # Switch to minimizing
+            child_val, _, child_nodes = minimax(child, False, child_depth, mode, budget, solutions) # Switch to minimizing
             nodes_explored += child_nodes
             # Update max value and best move
             if child_val > max_val:
@@ -109,12 +293,13 @@ def minimax(state, maximizing):
             # Tie-breaking: Prefer dividing by 3 if values are equal
             elif child_val == max_val and move == 3:
                  best_move = move
+        if solutions is not None and depth is None and (budget is None or not budget.exhausted):
+            solutions[state.key] = (max_val, best_move)
         return (max_val, best_move, nodes_explored)
     else: # Minimizing
         min_val = math.inf
         for child, move in moves:
-            # Recursive call - NO depth parameter passed
-            child_val, _, child_nodes = minimax(child, True) # Switch to maximizing
+            child_val, _, child_nodes = minimax(child, True, child_depth, mode, budget, solutions) # Switch to maximizing
             nodes_explored += child_nodes
             # Update min value and best move
             if child_val < min_val:
@@ -123,45 +308,55 @@ def minimax(state, maximizing):
             # Tie-breaking: Prefer dividing by 2 if values are equal
             elif child_val == min_val and move == 2:
                  best_move = move
+        if solutions is not None and depth is None and (budget is None or not budget.exhausted):
+            solutions[state.key] = (min_val, best_move)
         return (min_val, best_move, nodes_explored)
 
 
-# --- Alpha-Beta Algorithm (Unlimited Depth) ---
-def alphabeta(state, alpha, beta, maximizing):
+# --- Alpha-Beta Algorithm ---
+def alphabeta(state, alpha, beta, maximizing, depth=None, mode='static', budget=None, solutions=None):
     """
-    Performs minimax search with alpha-beta pruning WITHOUT depth limit.
+    Performs minimax search with alpha-beta pruning.
+    depth: Plies to search before falling back to GameState.evaluate(mode); None searches to the end.
+    budget: Optional SearchBudget; once spent, remaining nodes are estimated with evaluate(mode).
+    solutions: Optional dict; a full-depth search records canonical key -> (value, best_move_divisor)
+               of the positions whose value it proved exactly before the budget ran out (those
+               that ended strictly inside their window; cut-offs only give bounds).
     Returns (best_value, best_move_divisor, nodes_explored).
-    WARNING: Can be extremely slow or run indefinitely for large N.
+    WARNING: Without a depth limit this can be extremely slow for large N.
     """
     nodes_explored = 1
-    # Base case: ONLY stop at actual terminal game states
+    # Base case: actual terminal game states
     if state.terminal():
         # Use the heuristic value calculated specifically for terminal states
         return (state.h, None, nodes_explored)
+    # Depth limit or node budget reached: estimate the position statically
+    if (depth is not None and depth <= 0) or (budget is not None and budget.spend()):
+        return (state.evaluate(mode), None, nodes_explored)
+    child_depth = None if depth is None else depth - 1
+    window = (alpha, beta) # The value is exact when it ends strictly inside the original window
 
-    # Get available moves
+    # Get available moves, the tie-break favourite first (MAX prefers 3, MIN prefers 2).
+    # The other move then only wins when strictly better, and a pruned search of it returns
+    # a bound that can never beat the favourite, so ties resolve exactly as in minimax.
     moves = []
     if state.left: moves.append((state.left, 2))
     if state.right: moves.append((state.right, 3))
+    if maximizing:
+        moves.reverse()
 
     best_move = moves[0][1] # Default best move
 
     if maximizing:
         value = -math.inf
-        # Consider move order for potentially better pruning (e.g., evaluate preferred tie-break move first?)
-        # Simple iteration here:
         for child, move in moves:
-            # Recursive call - NO depth parameter passed
-            child_val, _, child_nodes = alphabeta(child, alpha, beta, False) # Switch to minimizing
+            child_val, _, child_nodes = alphabeta(child, alpha, beta, False, child_depth, mode, budget, solutions) # Switch to minimizing
             nodes_explored += child_nodes
 
             # Update the best value found so far for this maximizing node
             if child_val > value:
                 value = child_val
                 best_move = move # Update best move only when value improves
-            # Tie-breaking: Prefer 3
-            elif child_val == value and move == 3:
-                best_move = move
 
             # --- Pruning Check ---
             if value >= beta: # Check if current best value is already too high for the MIN parent
@@ -169,23 +364,20 @@ def alphabeta(state, alpha, beta, maximizing):
             # --- Update Alpha ---
             alpha = max(alpha, value) # Update the best option found for MAX along this path
 
+        if solutions is not None and depth is None and (budget is None or not budget.exhausted) and window[0] < value < window[1]:
+            solutions[state.key] = (value, best_move)
         return (value, best_move, nodes_explored)
 
     else: # Minimizing
         value = math.inf
-        # Consider move order for potentially better pruning
         for child, move in moves:
-            # Recursive call - NO depth parameter passed
-            child_val, _, child_nodes = alphabeta(child, alpha, beta, True) # Switch to maximizing
+            child_val, _, child_nodes = alphabeta(child, alpha, beta, True, child_depth, mode, budget, solutions) # Switch to maximizing
             nodes_explored += child_nodes
 
             # Update the best value found so far for this minimizing node
             if child_val < value:
                 value = child_val
                 best_move = move # Update best move only when value improves
-            # Tie-breaking: Prefer 2
-            elif child_val == value and move == 2:
-                 best_move = move
 
             # --- Pruning Check ---
             if value <= alpha: # Check if current best value is already too low for the MAX parent
@@ -193,4 +385,178 @@ def alphabeta(state, alpha, beta, maximizing):
             # --- Update Beta ---
             beta = min(beta, value) # Update the best option found for MIN along this path
 
+        if solutions is not None and depth is None and (budget is None or not budget.exhausted) and window[0] < value < window[1]:
+            solutions[state.key] = (value, best_move)
         return (value, best_move, nodes_explored)
+
+
+# --- Win/Draw/Loss Search ---
+def outcome_of(value):
+    """Maps an exact value to the outcome for the original starter: +1 win, 0 draw, -1 loss."""
+    return (value > 0) - (value < 0)
+
+
+def _outcome_search(state, alpha, beta, maximizing):
+    """
+    Alpha-beta over outcomes only (-1/0/+1). Returns (outcome, best_move_divisor, nodes_explored).
+    With the window (-1, 1) a node stops as soon as its side has proved a win.
+    """
+    nodes_explored = 1
+    if state.terminal():
+        return (outcome_of(state.h), None, nodes_explored)
+
+    # Try the tie-break favourite first: it is kept on equal outcomes, and a proved win
+    # (or loss for MIN) ends the node before the other move is ever generated
+    if maximizing:
+        moves = [(state.right, 3), (state.left, 2)]
+    else:
+        moves = [(state.left, 2), (state.right, 3)]
+
+    best_move = None
+    value = -2 if maximizing else 2 # Outside the outcome range
+    for child, move in moves:
+        if child is None:
+            continue
+        child_val, _, child_nodes = _outcome_search(child, alpha, beta, not maximizing)
+        nodes_explored += child_nodes
+        if (maximizing and child_val > value) or (not maximizing and child_val < value):
+            value = child_val
+            best_move = move
+        if maximizing:
+            if value >= beta:
+                break # Forced win proved (or better than MIN allows)
+            alpha = max(alpha, value)
+        else:
+            if value <= alpha:
+                break # Forced loss proved (or worse than MAX allows)
+            beta = min(beta, value)
+    return (value, best_move, nodes_explored)
+
+
+def solve_outcome(state, maximizing, exact=False):
+    """
+    Proves whether the position is a win (+1), draw (0) or loss (-1) for the original starter.
+    Explores far fewer nodes than exact scoring on decided positions because it stops at the
+    first move that forces the best reachable outcome.
+    exact: Also compute the exact score. The alpha-beta re-search is confined to the proved
+           outcome's band, and draws are always exactly 0.
+    Returns (outcome_or_exact_value, best_move_divisor, nodes_explored).
+    """
+    result, best_move, nodes = _outcome_search(state, -1, 1, maximizing)
+    if exact and state.terminal():
+        return (state.h, None, nodes) # The exact score is already known
+    if not exact or result == 0:
+        return (float(result) if exact else result, best_move, nodes)
+    # Wins score above 1000 and losses below -1000, so the proved band bounds the exact value
+    alpha, beta = (1000.0 - 1, math.inf) if result > 0 else (-math.inf, -1000.0 + 1)
+    value, best_move, exact_nodes = alphabeta(state, alpha, beta, maximizing)
+    return (value, best_move, nodes + exact_nodes)
+
+
+# --- Expectimax Against a Stochastic Opponent ---
+def expectimax(state, ai_turn, model=None, memo=None):
+    """
+    Expected value for the original starter when player `ai_turn` plays optimally and the
+    other player moves at random according to `model` (an OpponentModel; None = coin flips).
+    memo: canonical key -> (value, best_move_divisor). Positions reached by different move
+          orders are solved once; share it only between searches with the same model and ai_turn.
+    Returns (expected_value, best_move_divisor, nodes_explored).
+    """
+    if state.terminal():
+        return (state.h, None, 1)
+    if memo is None:
+        memo = {}
+    cached = memo.get(state.key)
+    if cached is not None:
+        return (cached[0], cached[1], 1)
+
+    nodes_explored = 1
+    moves = [(child, move) for child, move in ((state.left, 2), (state.right, 3)) if child is not None]
+    if state.turn == ai_turn:
+        maximizing = (state.turn == state.original_turn)
+        value, best_move = None, None
+        for child, move in moves:
+            child_val, _, child_nodes = expectimax(child, ai_turn, model, memo)
+            nodes_explored += child_nodes
+            # Same tie-breaking as minimax: MAX prefers 3, MIN prefers 2 (seen first)
+            if (value is None
+                    or (maximizing and (child_val > value or (child_val == value and move == 3)))
+                    or (not maximizing and child_val < value)):
+                value, best_move = child_val, move
+    else:
+        # Chance node: the opponent's move is drawn from the model
+        if model is not None:
+            p_left, p_right = model.move_probabilities(state)
+        else:
+            p_left = p_right = 1.0 / len(moves)
+        value, best_move = 0.0, None
+        for child, move in moves:
+            child_val, _, child_nodes = expectimax(child, ai_turn, model, memo)
+            nodes_explored += child_nodes
+            value += (p_left if move == 2 else p_right) * child_val
+    memo[state.key] = (value, best_move)
+    return (value, best_move, nodes_explored)
+
+
+# --- Whole-Subtree Solver ---
+def solve_tree(state, solutions=None):
+    """
+    Solves every non-terminal position below `state`, each one once per canonical key.
+    Values and moves are exactly what minimax returns from that position (tie-breaks included).
+    Returns solutions: canonical key -> (value, best_move_divisor).
+    """
+    if solutions is None:
+        solutions = {}
+    if state.terminal():
+        return solutions
+    if state.key in solutions:
+        return solutions
+    maximizing = (state.turn == state.original_turn)
+    best_value, best_move = None, None
+    for child, move in ((state.left, 2), (state.right, 3)):
+        if child is None:
+            continue
+        if child.terminal():
+            child_val = child.h
+        else:
+            solve_tree(child, solutions)
+            child_val = solutions[child.key][0]
+        # Same tie-breaking as minimax: MAX prefers 3, MIN prefers 2 (seen first)
+        if (best_value is None
+                or (maximizing and (child_val > best_value or (child_val == best_value and move == 3)))
+                or (not maximizing and child_val < best_value)):
+            best_value, best_move = child_val, move
+    solutions[state.key] = (best_value, best_move)
+    return solutions
+
+
+# --- Search Dispatcher ---
+def search(state, algorithm, depth=None, mode='static', budget=None, opponent_model=None, memo=None,
+           solutions=None):
+    """
+    Runs the named search algorithm from the given state.
+    The maximizing side is derived from the state itself (the original starter maximizes).
+    depth/mode: Optional depth limit and evaluation mode for non-terminal cut-off states.
+    budget: Optional SearchBudget for minimax/alphabeta (the outcome search always runs to the end).
+    opponent_model/memo: Used by 'expectimax' only, which also always runs to the end.
+    solutions: Optional dict filled by full-depth minimax/alphabeta searches (see minimax).
+    'auto' picks an engine per position (engine_select.auto_search) within its default time budget.
+    Returns (best_value, best_move_divisor, nodes_explored).
+    Raises ValueError for an unknown algorithm name.
+    """
+    maximizing = (state.turn == state.original_turn)
+    if algorithm == 'expectimax':
+        # The player to move is the AI; its opponent moves according to the model
+        return expectimax(state, state.turn, opponent_model, memo)
+    if algorithm == 'alphabeta':
+        return alphabeta(state, -math.inf, math.inf, maximizing, depth, mode, budget, solutions)
+    if algorithm == 'outcome':
+        # Win/draw/loss only: the returned value is the outcome, not a score
+        return solve_outcome(state, maximizing)
+    if algorithm == 'auto':
+        from engine_select import auto_search # engine_select imports this module
+        value, best_move, nodes, _ = auto_search(state, mode=mode)
+        return value, best_move, nodes
+    if algorithm == 'minimax':
+        return minimax(state, maximizing, depth, mode, budget, solutions)
+    raise ValueError(f"unknown algorithm {algorithm!r}")
@@ -0,0 +1,77 @@
+import os
+import sys
+import mmap
+import struct
+
+# Optional precomputed table of starting positions (written by solve_range.py). It is opened
+# on the first lookup, not at import, and memory-mapped so only the pages touched are read.
+RESULTS_FILE = "solved_table.bin"  # Sorted n -> (outcome, best first move, node count) records
+RESULTS_MAGIC = b"NDGS"
+RESULTS_VERSION = 1
+HEADER_FORMAT = "<4sBQ"            # magic, version, record count
+RECORD_FORMAT = "<QbBQ"            # n, outcome (-1/0/1), best first move (2/3, 0 = none), minimax node count
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+_table = None        # mmap of the results file once opened
+_count = 0           # Records in the table
+_unavailable = False # Set after a failed open so a missing table costs one stat, not one per move
+
+
+def table_path():
+    """Where the table is looked for: next to the bundled app files when frozen, else the working directory."""
+    base = getattr(sys, '_MEIPASS', None) # PyInstaller bundle directory
+    return os.path.join(base, RESULTS_FILE) if base else RESULTS_FILE
+
+
+def _open():
+    global _table, _count, _unavailable
+    path = table_path()
+    try:
+        with open(path, 'rb') as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        _unavailable = True # Missing (not bundled) or empty: fall back to searching
+        return
+    # A file shorter than the header (e.g. a partial copy) is as invalid as a wrong magic
+    magic, version, count = struct.unpack_from(HEADER_FORMAT, table) if len(table) >= HEADER_SIZE else (None, None, 0)
+    if magic != RESULTS_MAGIC or version != RESULTS_VERSION or len(table) != HEADER_SIZE + count * RECORD_SIZE:
+        print(f"Ignoring precomputed AI table {path}: not a valid version {RESULTS_VERSION} table")
+        table.close()
+        _unavailable = True
+        return
+    _table, _count = table, count
+
+
+def lookup(n):
+    """
+    Solved result of the starting position n (scores 0-0, starter to move) if the table has it.
+    Returns (outcome, best_move, nodes) with outcome +1/0/-1 for the starter, or None.
+    """
+    if _table is None:
+        if _unavailable:
+            return None
+        _open()
+        if _table is None:
+            return None
+    # Records are sorted by n: binary search straight on the mapped file
+    lo, hi = 0, _count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        mid_n = struct.unpack_from("<Q", _table, HEADER_SIZE + mid * RECORD_SIZE)[0]
+        if mid_n < n:
+            lo = mid + 1
+        elif mid_n > n:
+            hi = mid
+        else:
+            _, outcome, move, nodes = struct.unpack_from(RECORD_FORMAT, _table, HEADER_SIZE + mid * RECORD_SIZE)
+            return outcome, move or None, nodes
+    return None
+
+
+def is_starting_position(state):
+    """
+    True for positions the table can answer: 0-0 with the starter to move. Mid-game positions
+    like that (scores clamp at 0) are the same game as starting from their n.
+    """
+    return state.cp == 0 and state.pp == 0 and state.turn == state.original_turn
@@ -0,0 +1,185 @@
+import time
+import random
+import argparse
+import numpy as np
+from ai import GameState, minimax
+
+# Positions are packed into one int64 so they can be deduplicated and looked up with
+# np.unique / np.searchsorted. n sits in the high bits, so sorted keys are sorted by n.
+N_SHIFT = 20
+CP_SHIFT = 12
+PP_SHIFT = 4
+TURN_SHIFT = 2
+SCORE_LIMIT = 1 << 8  # cp and pp are stored in 8 bits each
+N_LIMIT = 1 << 43     # Keeps the packed key inside a signed 64-bit integer
+
+
+def _pack(n, cp, pp, turn, orig):
+    return (n << N_SHIFT) | (cp << CP_SHIFT) | (pp << PP_SHIFT) | (turn << TURN_SHIFT) | orig
+
+
+def _unpack(keys):
+    return (keys >> N_SHIFT, (keys >> CP_SHIFT) & 0xFF, (keys >> PP_SHIFT) & 0xFF,
+            (keys >> TURN_SHIFT) & 0x3, keys & 0x3)
+
+
+def _has_move(n, divisor):
+    """Mask of positions where dividing by `divisor` is legal (same rule as GameState)."""
+    return (n > 3) & (n % divisor == 0)
+
+
+def _children(n, cp, pp, turn, orig, divisor):
+    """
+    Vectorized GameState.create_child for every position where the move is legal.
+    Returns (legal_mask, child_keys); child_keys only covers the legal positions.
+    """
+    legal = _has_move(n, divisor)
+    child_n = n[legal] // divisor
+    mover = turn[legal]
+    # Points awarded: +1 if the new number is even, -1 if odd, to the player who moved
+    pt = np.where(child_n % 2 == 0, 1, -1)
+    child_cp = np.maximum(0, cp[legal] + np.where(mover == 2, pt, 0))
+    child_pp = np.maximum(0, pp[legal] + np.where(mover == 1, pt, 0))
+    # Turns switch, except that a state with n <= 3 has no player to move (0 here, None in GameState)
+    child_turn = np.where(child_n <= 3, 0, np.where(mover == 1, 2, 1))
+    return legal, _pack(child_n, child_cp, child_pp, child_turn, orig[legal])
+
+
+def _terminal_values(cp, pp, orig):
+    """Vectorized GameState.heuristic for terminal positions."""
+    score_diff = np.where(orig == 1, pp - cp, cp - pp)
+    return np.where(score_diff > 0, 1000.0 + score_diff,
+                    np.where(score_diff < 0, -1000.0 + score_diff, 0.0))
+
+
+def _bit_length(n):
+    """Element-wise int.bit_length for non-negative int64 arrays."""
+    lengths = np.zeros(n.shape, dtype=np.int64)
+    remaining = n.copy()
+    while remaining.any():
+        lengths += remaining > 0
+        remaining >>= 1
+    return lengths
+
+
+def evaluate_positions(n, cp, pp, turn, original_turn):
+    """
+    Exact values and best moves for many positions at once.
+    Inputs are equal-length array-likes; turn is 0 for positions with no player to move.
+    Returns (values, moves) as NumPy arrays; moves holds 2, 3 or 0 (terminal).
+    Values and moves (including tie-breaking) match ai.minimax position by position.
+    """
+    n = np.asarray(n, dtype=np.int64)
+    cp = np.asarray(cp, dtype=np.int64)
+    pp = np.asarray(pp, dtype=np.int64)
+    turn = np.asarray(turn, dtype=np.int64)
+    orig = np.asarray(original_turn, dtype=np.int64)
+    if n.size == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    if n.min() < 0 or n.max() >= N_LIMIT:
+        raise ValueError(f"n must be in [0, {N_LIMIT})")
+    if ((turn == 0) & (n > 3)).any():
+        raise ValueError("positions with n > 3 need a player to move (turn 1 or 2)")
+    # Every move adds at most one point, so scores stay below this bound for the whole subtree
+    max_depth = int(n.max()).bit_length()
+    if max(cp.max(), pp.max()) + max_depth >= SCORE_LIMIT:
+        raise ValueError(f"scores must stay below {SCORE_LIMIT - max_depth}")
+
+    # --- Forward pass: collect every position reachable from the inputs ---
+    root_keys = _pack(n, cp, pp, turn, orig)
+    frontier = np.unique(root_keys)
+    levels = [frontier]
+    while frontier.size:
+        fn, fcp, fpp, fturn, forig = _unpack(frontier)
+        _, left = _children(fn, fcp, fpp, fturn, forig, 2)
+        _, right = _children(fn, fcp, fpp, fturn, forig, 3)
+        frontier = np.unique(np.concatenate((left, right)))
+        levels.append(frontier)
+    keys = np.unique(np.concatenate(levels)) # Sorted, hence ordered by n
+    kn, kcp, kpp, kturn, korig = _unpack(keys)
+
+    values = np.zeros(keys.size)
+    moves = np.zeros(keys.size, dtype=np.int64)
+    terminal = ~(_has_move(kn, 2) | _has_move(kn, 3))
+    values[terminal] = _terminal_values(kcp[terminal], kpp[terminal], korig[terminal])
+
+    # --- Backward induction: both children of n have a smaller bit length than n,
+    # so solving bucket by bucket in increasing bit length always finds them solved ---
+    lengths = _bit_length(kn)
+    for length in np.unique(lengths[~terminal]):
+        idx = np.flatnonzero(~terminal & (lengths == length))
+        bn, bcp, bpp, bturn, borig = kn[idx], kcp[idx], kpp[idx], kturn[idx], korig[idx]
+
+        has_left, left_keys = _children(bn, bcp, bpp, bturn, borig, 2)
+        has_right, right_keys = _children(bn, bcp, bpp, bturn, borig, 3)
+        left_val = np.full(idx.size, np.nan)
+        right_val = np.full(idx.size, np.nan)
+        left_val[has_left] = values[np.searchsorted(keys, left_keys)]
+        right_val[has_right] = values[np.searchsorted(keys, right_keys)]
+
+        maximizing = bturn == borig # The original starter maximizes
+        both = has_left & has_right
+        # Tie-breaking as in minimax: MAX prefers 3 on equal values, MIN prefers 2
+        pick_right = np.where(maximizing, right_val >= left_val, right_val < left_val)
+        pick_right = np.where(both, pick_right, has_right)
+        values[idx] = np.where(pick_right, right_val, left_val)
+        moves[idx] = np.where(pick_right, 3, 2)
+
+    positions = np.searchsorted(keys, root_keys)
+    return values[positions], moves[positions]
+
+
+def evaluate_states(states):
+    """Convenience wrapper: evaluates a sequence of GameState objects."""
+    return evaluate_positions(
+        [s.n for s in states], [s.cp for s in states], [s.pp for s in states],
+        [s.turn or 0 for s in states], [s.original_turn for s in states],
+    )
+
+
+def verify_against_minimax(count, seed=0, max_n=30000, max_score=5):
+    """
+    Compares evaluate_positions with ai.minimax on `count` random positions.
+    Returns the list of mismatches as (n, cp, pp, turn, orig, expected, actual) tuples.
+    """
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        n = rng.randint(1, max_n)
+        if rng.random() < 0.5:
+            n -= n % 6 # Multiples of 6 give the deeper trees the game actually starts from
+        orig = rng.choice((1, 2))
+        turn = 0 if n <= 3 else rng.choice((1, 2))
+        positions.append((n, rng.randint(0, max_score), rng.randint(0, max_score), turn, orig))
+
+    values, moves = evaluate_positions(*zip(*positions))
+    mismatches = []
+    for (n, cp, pp, turn, orig), value, move in zip(positions, values, moves):
+        state = GameState(n, cp, pp, 0, turn or None, orig)
+        expected_value, expected_move, _ = minimax(state, turn == orig)
+        if (expected_value, expected_move or 0) != (value, move):
+            mismatches.append((n, cp, pp, turn, orig, (expected_value, expected_move), (value, move)))
+    return mismatches
+
+
+# --- Verification / Benchmark Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch position evaluation with NumPy.")
+    parser.add_argument("--verify", type=int, default=2000, help="Random positions checked against minimax")
+    parser.add_argument("--bench", type=int, default=0, help="Time a batch of this many random positions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.verify:
+        failures = verify_against_minimax(args.verify, args.seed)
+        print(f"Verified {args.verify:,} positions against minimax: {len(failures)} mismatches")
+        for failure in failures[:10]:
+            print("  ", failure)
+    if args.bench:
+        rng = np.random.default_rng(args.seed)
+        n = rng.integers(10000 // 6, 20000 // 6, args.bench) * 6
+        zeros = np.zeros(args.bench, dtype=np.int64)
+        start_time = time.perf_counter()
+        evaluate_positions(n, zeros, zeros, zeros + 1, zeros + 1)
+        elapsed = time.perf_counter() - start_time
+        print(f"Evaluated {args.bench:,} positions in {elapsed:.3f}s ({args.bench / elapsed:,.0f} positions/s)")
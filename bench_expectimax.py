@@ -0,0 +1,85 @@
+import math
+import time
+import random
+import argparse
+from ai import StatePool, alphabeta, expectimax
+from opponent_model import load_model
+
+AI_PLAYER = 2 # The AI is always player 2 in AI mode
+
+
+def starting_numbers(count, rng):
+    """Multiples of 6 in [10000, 20000], like MainMenu.generate_valid_numbers."""
+    return [rng.randrange(10002, 20000, 6) for _ in range(count)]
+
+
+def play(root, engine, model, rng):
+    """
+    Plays one game: the AI moves with `engine`, the opponent samples from `model`.
+    Returns the final score difference from the AI's point of view.
+    """
+    state = root
+    memo = {}
+    while not state.terminal():
+        if state.turn == AI_PLAYER:
+            if engine == 'expectimax':
+                _, move, _ = expectimax(state, AI_PLAYER, model, memo)
+            else:
+                _, move, _ = alphabeta(state, -math.inf, math.inf, state.turn == state.original_turn)
+        else:
+            p_left, _ = model.move_probabilities(state)
+            move = 2 if rng.random() < p_left else 3
+        state = state.left if move == 2 else state.right
+    return state.cp - state.pp # cp is player 2's score
+
+
+def benchmark(count, games, model_kind, seed):
+    rng = random.Random(seed)
+    model = load_model(model_kind)
+    numbers = starting_numbers(count, rng)
+    totals = {engine: {'nodes': 0, 'time': 0.0, 'diff': 0, 'wins': 0, 'draws': 0, 'losses': 0}
+              for engine in ('alphabeta', 'expectimax')}
+
+    for n in numbers:
+        for starter in (1, 2):
+            root = StatePool().intern(n, 0, 0, 0, starter, starter)
+            # Search cost from the first position where the AI moves
+            position = root if starter == AI_PLAYER else (root.left or root.right)
+            if position.terminal():
+                continue
+            start_time = time.perf_counter()
+            _, _, nodes = alphabeta(position, -math.inf, math.inf, position.turn == position.original_turn)
+            totals['alphabeta']['time'] += time.perf_counter() - start_time
+            totals['alphabeta']['nodes'] += nodes
+            start_time = time.perf_counter()
+            _, _, nodes = expectimax(position, AI_PLAYER, model)
+            totals['expectimax']['time'] += time.perf_counter() - start_time
+            totals['expectimax']['nodes'] += nodes
+
+            # Same opponent dice for both engines
+            game_seed = rng.random()
+            for engine, total in totals.items():
+                game_rng = random.Random(game_seed)
+                for _ in range(games):
+                    diff = play(root, engine, model, game_rng)
+                    total['diff'] += diff
+                    total['wins' if diff > 0 else 'losses' if diff < 0 else 'draws'] += 1
+
+    played = sum(totals['alphabeta'][k] for k in ('wins', 'draws', 'losses'))
+    print(f"{len(numbers)} starting numbers x 2 starters, {games} games each vs the {model.name} opponent model")
+    print(f"{'engine':<11} {'nodes':>12} {'time (s)':>10} {'win %':>7} {'draw %':>7} {'loss %':>7} {'avg diff':>9}")
+    for engine, total in totals.items():
+        print(f"{engine:<11} {total['nodes']:>12,} {total['time']:>10.4f} "
+              f"{100 * total['wins'] / played:>7.1f} {100 * total['draws'] / played:>7.1f} "
+              f"{100 * total['losses'] / played:>7.1f} {total['diff'] / played:>9.3f}")
+
+
+# --- Benchmark Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare expectimax and alpha-beta against a stochastic opponent.")
+    parser.add_argument("--count", type=int, default=200, help="Starting numbers sampled")
+    parser.add_argument("--games", type=int, default=20, help="Games per starting number and starter")
+    parser.add_argument("--model", choices=("uniform", "fitted"), default="uniform")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark(args.count, args.games, args.model, args.seed)
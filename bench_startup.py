@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+import statistics
+import subprocess
+
+# Launch-time benchmark: starts the app repeatedly and measures the wall time until the first
+# window is drawn (main.py writes that time when NDG_STARTUP_BENCH is set, then quits).
+SPECS = {'onefile': "main.spec", 'fast': "main_fast.spec"}
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""
+DEFAULT_TARGETS = {
+    'onefile': os.path.join("dist", "main" + EXE_SUFFIX),                       # main.spec
+    'fast': os.path.join("dist", "main_fast", "main_fast" + EXE_SUFFIX),       # main_fast.spec
+}
+LAUNCH_TIMEOUT = 60 # Seconds before a launch is considered hung
+
+
+def build(names):
+    """Runs PyInstaller for the given profiles."""
+    for name in names:
+        print(f"Building {name} ({SPECS[name]})...")
+        subprocess.run([sys.executable, "-m", "PyInstaller", "--noconfirm", SPECS[name]], check=True)
+
+
+def launch_time(command):
+    """Starts `command` once. Returns seconds from launch until the first window was drawn."""
+    fd, ready_file = tempfile.mkstemp(prefix="ndg_startup_")
+    os.close(fd)
+    os.remove(ready_file) # The app creates it when ready
+    env = dict(os.environ, NDG_STARTUP_BENCH=ready_file)
+    try:
+        start = time.time()
+        subprocess.run(command, env=env, timeout=LAUNCH_TIMEOUT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(ready_file, 'r') as f:
+            return float(f.read()) - start
+    finally:
+        if os.path.exists(ready_file):
+            os.remove(ready_file)
+
+
+def bundle_size(name):
+    """Bytes on disk of a built profile: the executable, or its whole folder for the one-dir build."""
+    path = DEFAULT_TARGETS[name]
+    if name != 'fast':
+        return os.path.getsize(path)
+    folder = os.path.dirname(path)
+    return sum(os.path.getsize(os.path.join(root, file)) for root, _, files in os.walk(folder) for file in files)
+
+
+def benchmark(targets, runs):
+    """Launches the targets round-robin (so drift affects all equally) and prints the results."""
+    times = {name: [] for name in targets}
+    for run in range(runs + 1):
+        for name, command in targets.items():
+            elapsed = launch_time(command)
+            if run == 0:
+                print(f"{name:<8} first (cold) launch: {elapsed * 1000:.0f}ms")
+            else:
+                times[name].append(elapsed)
+
+    print(f"\n{'target':<8} {'min':>8} {'median':>8} {'max':>8} {'size':>10}   ({runs} warm launches)")
+    for name, samples in times.items():
+        size = f"{bundle_size(name) / 1e6:.1f}MB" if name in DEFAULT_TARGETS else "-"
+        print(f"{name:<8} {min(samples) * 1000:>6.0f}ms {statistics.median(samples) * 1000:>6.0f}ms "
+              f"{max(samples) * 1000:>6.0f}ms {size:>10}")
+    if 'onefile' in times and 'fast' in times:
+        speedup = statistics.median(times['onefile']) / statistics.median(times['fast'])
+        print(f"\nStartup-optimized build launches {speedup:.1f}x faster (median)")
+
+
+# --- Benchmark Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare app launch times of the PyInstaller build profiles.")
+    parser.add_argument("--runs", type=int, default=10, help="Warm launches per target (after one cold launch)")
+    parser.add_argument("--build", action="store_true", help="Build both profiles with PyInstaller first")
+    parser.add_argument("--source", action="store_true", help="Also time `python main.py` from source")
+    args = parser.parse_args()
+
+    if args.build:
+        build(SPECS)
+    targets = {}
+    for name, path in DEFAULT_TARGETS.items():
+        if os.path.exists(path):
+            targets[name] = [path]
+        else:
+            print(f"Skipping {name}: {path} not found (run with --build)")
+    if args.source:
+        targets['source'] = [sys.executable, "main.py"]
+    if not targets:
+        sys.exit("Nothing to launch")
+    benchmark(targets, args.runs)
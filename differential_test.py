@@ -0,0 +1,295 @@
+import os
+import sys
+import math
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+from collections import namedtuple
+import ai_table
+import solve_range
+import state_key
+from ai import GameState, StatePool, StreamingGameState, minimax, alphabeta, solve_outcome, solve_tree, outcome_of
+from engine_select import auto_search
+
+# Differential harness: every registered engine must return what ai.minimax returns (value and
+# move, tie-breaks included) on randomly generated positions. Engines are timed in the same run.
+
+Position = namedtuple("Position", ["n", "cp", "pp", "turn", "orig"]) # turn is None on terminal numbers
+
+ENGINES = {} # name -> (solve, checks); solve(positions, states) -> [(value, move) or None], None = not covered
+START_RANGE = (10000, 20001) # Starting numbers random_position draws (the multiples of 6 in it)
+
+
+def register(name, checks=('value', 'move')):
+    """
+    Registers an engine. checks lists what it promises to match: 'value' (exact minimax value),
+    'outcome' (only the win/draw/loss sign of it) and/or 'move'. An engine may return None for
+    a position it does not cover, and None as the value when it only reports a move.
+    """
+    def decorator(solve):
+        ENGINES[name] = (solve, checks)
+        return solve
+    return decorator
+
+
+def _maximizing(state):
+    return state.turn == state.original_turn
+
+
+def reference(state):
+    value, move, _ = minimax(state, _maximizing(state))
+    return value, move
+
+
+@register('alphabeta')
+def _alphabeta(positions, states):
+    return [alphabeta(s, -math.inf, math.inf, _maximizing(s))[:2] for s in states]
+
+
+@register('outcome', checks=('outcome',))
+def _outcome(positions, states):
+    # The outcome search breaks ties between equal outcomes, not equal scores: no move check
+    return [solve_outcome(s, _maximizing(s))[:2] for s in states]
+
+
+@register('outcome_exact')
+def _outcome_exact(positions, states):
+    return [solve_outcome(s, _maximizing(s), exact=True)[:2] for s in states]
+
+
+@register('solve_tree')
+def _solve_tree(positions, states):
+    results = []
+    for s in states:
+        results.append((s.h, None) if s.terminal() else solve_tree(s)[s.key])
+    return results
+
+
+@register('minimax_pooled')
+def _minimax_pooled(positions, states):
+    # Builds its own interned tree (the build is part of the timing)
+    results = []
+    for p in positions:
+        state = StatePool().intern(p.n, p.cp, p.pp, 0, p.turn, p.orig)
+        results.append(minimax(state, _maximizing(state))[:2])
+    return results
+
+
+@register('minimax_streaming')
+def _minimax_streaming(positions, states):
+    results = []
+    for p in positions:
+        state = StreamingGameState(p.n, p.cp, p.pp, 0, p.turn, p.orig)
+        results.append(minimax(state, _maximizing(state))[:2])
+    return results
+
+
+@register('auto')
+def _auto(positions, states):
+    results = []
+    for s in states:
+        if s.terminal():
+            results.append((s.h, None))
+            continue
+        # An unlimited budget makes auto pick an exact engine. Forced moves report no value, and
+        # the table tier only an outcome (checked by the ai_table engine), so only their move is compared.
+        value, move, _, engine = auto_search(s, None, time_budget=math.inf, log_path=None)
+        results.append((None if engine == 'table' else value, move))
+    return results
+
+
+@register('solve_range')
+def _solve_range(positions, states):
+    # The parallel solver's per-position search, with only the local memo (no shared table)
+    results = []
+    for p in positions:
+        starter, other = (p.pp, p.cp) if p.orig == 1 else (p.cp, p.pp)
+        value, move, _ = solve_range.solve_position(p.n, starter, other, p.turn == p.orig,
+                                                    state_key.remaining_depth(p.n))
+        results.append((value, move))
+    solve_range._memo.clear()
+    return results
+
+
+@register('ai_table', checks=('outcome', 'move'))
+def _ai_table(positions, states):
+    # Opening book: only starting positions (0-0, starter to move) that are in solved_table.bin
+    results = []
+    for s in states:
+        solved = ai_table.lookup(s.n) if ai_table.is_starting_position(s) and not s.terminal() else None
+        results.append(solved[:2] if solved is not None else None)
+    return results
+
+
+try:
+    from batch_eval import evaluate_positions
+except ImportError:
+    evaluate_positions = None # NumPy is optional
+
+if evaluate_positions is not None:
+    @register('batch_eval')
+    def _batch_eval(positions, states):
+        values, moves = evaluate_positions([p.n for p in positions], [p.cp for p in positions],
+                                           [p.pp for p in positions], [p.turn or 0 for p in positions],
+                                           [p.orig for p in positions])
+        return [(float(value), int(move) or None) for value, move in zip(values, moves)]
+
+
+# --- Position Generation ---
+def random_position(rng, max_n, max_score):
+    """One random position, drawn from a mix of the shapes that stress different code paths."""
+    kind = rng.random()
+    if kind < 0.3:
+        # Real game starts: a multiple of 6 in [10000, 20000], nothing played yet
+        orig = rng.choice((1, 2))
+        return Position(rng.randrange(START_RANGE[0] + 2, START_RANGE[1] - 1, 6), 0, 0, orig, orig)
+    if kind < 0.55:
+        # Smooth numbers 2^a 3^b * k: the deepest trees and the most transpositions
+        a, b = rng.randint(0, 9), rng.randint(0, 7)
+        n = 2 ** a * 3 ** b * rng.choice((1, 1, 5, 7, 25))
+    else:
+        n = rng.randint(1, max_n)
+        if rng.random() < 0.5:
+            n -= n % 6
+    n = max(n, 1)
+    # Scores are sometimes far above the moves left, where canonical keys keep only their difference
+    high = max_score if rng.random() < 0.8 else 4 * max_score
+    orig = rng.choice((1, 2))
+    turn = None if n <= 3 else rng.choice((1, 2))
+    return Position(n, rng.randint(0, high), rng.randint(0, high), turn, orig)
+
+
+def build_state(p):
+    return GameState(p.n, p.cp, p.pp, 0, p.turn, p.orig)
+
+
+def compare(expected, actual, checks):
+    """Returns the names of the promised checks `actual` fails."""
+    if actual is None:
+        return []
+    failed = []
+    value, move = actual
+    if 'value' in checks and value is not None and value != expected[0]:
+        failed.append('value')
+    if 'outcome' in checks and value is not None and outcome_of(value) != outcome_of(expected[0]):
+        failed.append('outcome')
+    if 'move' in checks and (move or None) != expected[1]:
+        failed.append('move')
+    return failed
+
+
+def shrink(position, name):
+    """
+    Greedily replaces a failing position by smaller ones that still fail for engine `name`,
+    so the report shows a minimal counterexample.
+    """
+    solve, checks = ENGINES[name]
+
+    def fails(p):
+        state = build_state(p)
+        return bool(compare(reference(state), solve([p], [state])[0], checks))
+
+    improved = True
+    while improved:
+        improved = False
+        p = position
+        candidates = [p._replace(cp=p.cp - 1) if p.cp else None, p._replace(pp=p.pp - 1) if p.pp else None]
+        for divisor in (2, 3, 6):
+            if p.n % divisor == 0 and p.n // divisor > 3:
+                candidates.append(p._replace(n=p.n // divisor))
+        for candidate in candidates:
+            if candidate is not None and fails(candidate):
+                position, improved = candidate, True
+                break
+    return position
+
+
+@contextlib.contextmanager
+def starting_table():
+    """
+    Lets the ai_table engine answer: without a solved_table.bin, a temporary table of the
+    starting numbers in START_RANGE is solved with solve_range (well under a second).
+    """
+    ai_table.lookup(0) # Opens the table, if there is one
+    if ai_table._table is not None:
+        yield
+        return
+    saved_file = ai_table.RESULTS_FILE
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"No {saved_file}: solving a temporary table for starting numbers in [{START_RANGE[0]}, {START_RANGE[1]})")
+        ai_table.RESULTS_FILE = os.path.join(directory, saved_file)
+        solve_range.solve_range(*START_RANGE, output=ai_table.RESULTS_FILE, table_slots=1 << 16)
+        ai_table._unavailable = False
+        try:
+            yield
+        finally:
+            if ai_table._table is not None:
+                ai_table._table.close()
+            ai_table._table, ai_table._count = None, 0
+            ai_table.RESULTS_FILE = saved_file
+
+
+def run(count, seed, max_n, max_score, engines, show):
+    rng = random.Random(seed)
+    positions = [random_position(rng, max_n, max_score) for _ in range(count)]
+    states = [build_state(p) for p in positions] # Shared eager trees (not timed)
+
+    reference_times = []
+    expected = []
+    for state in states:
+        start_time = time.perf_counter()
+        expected.append(reference(state))
+        reference_times.append(time.perf_counter() - start_time)
+
+    print(f"{count:,} random positions (seed {seed}), reference ai.minimax took {sum(reference_times):.3f}s\n")
+    print(f"{'engine':<18} {'checks':<16} {'covered':>8} {'failures':>9} {'time (s)':>9} {'speedup':>8}")
+    failures = {}
+    covered_counts = {}
+    for name in engines:
+        solve, checks = ENGINES[name]
+        start_time = time.perf_counter()
+        results = solve(positions, states)
+        elapsed = time.perf_counter() - start_time
+        covered = [i for i, result in enumerate(results) if result is not None]
+        failing = [(i, compare(expected[i], results[i], checks)) for i in covered]
+        failing = [(i, failed) for i, failed in failing if failed]
+        failures[name] = failing
+        covered_counts[name] = len(covered)
+        # Speedup over minimax on the positions the engine covered
+        covered_reference = sum(reference_times[i] for i in covered)
+        speedup = f"{covered_reference / elapsed:.1f}x" if covered and elapsed > 0 else "-"
+        print(f"{name:<18} {'+'.join(checks):<16} {len(covered):>8,} {len(failing):>9,} {elapsed:>9.3f} {speedup:>8}")
+
+    # An engine that answered nothing was not checked at all: that is not a pass
+    any_failure = False
+    for name in engines:
+        if count and not covered_counts[name]:
+            any_failure = True
+            print(f"\n{name}: covered none of the positions, so it was not checked")
+    for name, failing in failures.items():
+        if not failing:
+            continue
+        any_failure = True
+        print(f"\n{name}: {len(failing)} mismatches, first {min(show, len(failing))} (shrunk):")
+        for i, failed in failing[:show]:
+            p = shrink(positions[i], name)
+            state = build_state(p)
+            print(f"  {p}  {'/'.join(failed)}: minimax {reference(state)}, {name} {ENGINES[name][0]([p], [state])[0]}")
+    return not any_failure
+
+
+# --- Harness Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check every registered engine against ai.minimax on random positions.")
+    parser.add_argument("--count", type=int, default=2000, help="Random positions generated")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-n", type=int, default=300_000, help="Upper bound for uniformly drawn numbers")
+    parser.add_argument("--max-score", type=int, default=6)
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=list(ENGINES))
+    parser.add_argument("--show", type=int, default=5, help="Mismatches printed per engine")
+    args = parser.parse_args()
+    with starting_table() if 'ai_table' in args.engines else contextlib.nullcontext():
+        passed = run(args.count, args.seed, args.max_n, args.max_score, args.engines, args.show)
+    sys.exit(0 if passed else 1)
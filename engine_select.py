@@ -0,0 +1,138 @@
+import os
+import json
+import math
+import time
+import ai_table
+from ai import alphabeta
+from solution_cache import canonical_key
+
+SELECTION_LOG_FILE = "ai_selection_log.jsonl" # Selection log written when NDG_SELECTION_LOG=1
+# Set NDG_SELECTION_LOG=1 (or to a file path) to log every 'auto' decision, for tuning the predictor.
+# It is the default of the Game setting 'selection_log' and of the server's --selection-log.
+_selection_log_env = os.environ.get("NDG_SELECTION_LOG")
+DEFAULT_SELECTION_LOG = (SELECTION_LOG_FILE if _selection_log_env == "1" else _selection_log_env) or None
+DEFAULT_TIME_BUDGET = 0.25 # Seconds the auto mode aims to stay under per move
+# Predictor constants (tune from the selection log)
+NODES_PER_SECOND = 1_000_000 # Alpha-beta throughput on the eager tree
+ALPHABETA_EXPONENT = 0.7     # Alpha-beta visits roughly full_tree_nodes ** exponent nodes
+EXACT_ALGORITHMS = ('alphabeta', 'minimax') # Cache entries the auto mode can trust
+
+
+def valuations(n):
+    """(exponent of 2, exponent of 3) in n."""
+    a = b = 0
+    while n > 0 and n % 2 == 0:
+        n //= 2
+        a += 1
+    while n > 0 and n % 3 == 0:
+        n //= 3
+        b += 1
+    return a, b
+
+
+def predict_tree_size(n):
+    """
+    Predicted node count of the full game tree below n. Every path removes a factor 2 or 3,
+    so the tree is the lattice of (i, j) with i <= a, j <= b reached along C(i + j, i) paths;
+    summed that is C(a + b + 2, a + 1) - 1 (an upper bound, as play stops once n <= 3).
+    """
+    a, b = valuations(n)
+    return math.comb(a + b + 2, a + 1) - 1
+
+
+def predict_alphabeta_nodes(n):
+    return max(1, round(predict_tree_size(n) ** ALPHABETA_EXPONENT))
+
+
+def iterative_deepening(state, maximizing, time_budget=math.inf, mode='static', budget=None):
+    """
+    Anytime search: depth-limited alpha-beta at depth 1, 2, ... until the next iteration
+    would not fit in the time budget (or the search already reaches the end of the game).
+    budget: Optional SearchBudget shared by all iterations. An iteration it cuts short is
+            discarded (after depth 1) and the deepest completed one is returned, so every root
+            move is compared at the same depth instead of the first one using up the nodes.
+    Returns (value, best_move, nodes, depth_reached); the result is exact when
+    depth_reached >= state.remaining.
+    """
+    start_time = time.perf_counter()
+    total_nodes = 0
+    depth = 0
+    value, best_move = None, None
+    while True:
+        depth += 1
+        iteration_start = time.perf_counter()
+        iteration = alphabeta(state, -math.inf, math.inf, maximizing, depth, mode, budget)
+        total_nodes += iteration[2]
+        iteration_time = time.perf_counter() - iteration_start
+        # Node budget ran out mid-iteration: keep the last complete one (depth 1 always completes,
+        # as the budget covers at least the root)
+        if budget is not None and budget.exhausted and depth > 1:
+            depth -= 1
+            break
+        value, best_move = iteration[:2]
+        if depth >= state.remaining:
+            break # Every line reaches a terminal state: the result is exact
+        # The next iteration costs roughly twice this one (branching factor <= 2)
+        if time.perf_counter() - start_time + 2 * iteration_time > time_budget:
+            break
+    return value, best_move, total_nodes, depth
+
+
+def auto_search(state, solution_cache=None, time_budget=DEFAULT_TIME_BUDGET, mode='static',
+                log_path=None):
+    """
+    Picks the cheapest engine that can answer within the time budget:
+      forced     - only one legal move, nothing to search
+      table      - starting position in the precomputed table (ai_table; value is the outcome)
+      cache      - position already solved exactly (solution cache)
+      alphabeta  - exact search, when the predicted cost fits the budget
+      deepening  - depth-limited anytime search otherwise
+    When `log_path` is given, the decision and predicted vs actual cost are appended to it as
+    one JSON line, for tuning the predictor.
+    Returns (value, best_move, nodes, engine).
+    """
+    maximizing = (state.turn == state.original_turn)
+    predicted_nodes = predict_alphabeta_nodes(state.n)
+    predicted_time = predicted_nodes / NODES_PER_SECOND
+    start_time = time.perf_counter()
+    value, best_move, nodes, depth = None, None, 0, None
+
+    if state.left is None or state.right is None:
+        engine = 'forced'
+        best_move = 2 if state.left is not None else 3
+    else:
+        engine = None
+        if ai_table.is_starting_position(state):
+            solved = ai_table.lookup(state.n)
+            if solved is not None:
+                engine = 'table'
+                value, best_move, _ = solved
+        if engine is None and solution_cache is not None:
+            for algorithm in EXACT_ALGORITHMS:
+                cached = solution_cache.get(canonical_key(state, algorithm))
+                if cached is not None:
+                    engine = 'cache'
+                    value, best_move = cached
+                    break
+        if engine is None and predicted_time <= time_budget:
+            engine = 'alphabeta'
+            value, best_move, nodes = alphabeta(state, -math.inf, math.inf, maximizing)
+            if solution_cache is not None:
+                solution_cache.put(canonical_key(state, 'alphabeta'), value, best_move)
+        elif engine is None:
+            engine = 'deepening'
+            value, best_move, nodes, depth = iterative_deepening(state, maximizing, time_budget, mode)
+
+    actual_time = time.perf_counter() - start_time
+    if log_path:
+        entry = {
+            'n': state.n, 'engine': engine, 'budget': time_budget,
+            'predicted_nodes': predicted_nodes, 'actual_nodes': nodes,
+            'predicted_time': predicted_time, 'actual_time': actual_time, 'depth': depth,
+        }
+        try:
+            with open(log_path, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+        except IOError as e:
+            print(f"Error writing selection log to {log_path}: {e}")
+    return value, best_move, nodes, engine
@@ -0,0 +1,116 @@
+import queue
+import threading
+
+# Events published by game_logic.Game (payload keyword arguments in parentheses)
+MOVE_APPLIED = "move_applied"       # (game, divisor, state, by_ai)
+SEARCH_STARTED = "search_started"   # (game, n, algorithm)
+SEARCH_PROGRESS = "search_progress" # (game, nodes) every PROGRESS_INTERVAL nodes of a running search
+SEARCH_FINISHED = "search_finished" # (game, divisor, ai_time, nodes, cache_hit)
+GAME_OVER = "game_over"             # (game, winner)
+
+PROGRESS_INTERVAL = 20_000 # Nodes between two SEARCH_PROGRESS events
+TK_VIRTUAL_EVENT = "<<GameEvent>>"
+FALLBACK_POLL_MS = 250     # Safety-net poll of the queue, for events whose wake-up could not be posted
+
+
+class EventBus:
+    """
+    Publish/subscribe between the game logic and its front end.
+    publish() may be called from any thread. Without a waker, handlers run right away on the
+    publishing thread. With one (see TkEventBridge), events are queued and the waker asks the
+    owning loop to call dispatch_pending(), so handlers always run on that loop's thread.
+    """
+
+    def __init__(self):
+        self._handlers = {} # Event name -> list of handlers
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self.waker = None
+
+    def subscribe(self, event, handler):
+        with self._lock:
+            self._handlers.setdefault(event, []).append(handler)
+        return handler
+
+    def unsubscribe(self, event, handler):
+        with self._lock:
+            handlers = self._handlers.get(event, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def publish(self, event, **payload):
+        self.call_soon(self._deliver, event, payload)
+
+    def call_soon(self, callback, *args):
+        """
+        Runs callback(*args) on the owning loop's thread, after the events already queued
+        (right away without a waker). Lets worker threads hand results back to the front end.
+        """
+        if self.waker is None:
+            callback(*args)
+            return
+        self._queue.put((callback, args))
+        self.waker()
+
+    def has_pending(self):
+        return not self._queue.empty()
+
+    def dispatch_pending(self):
+        """Delivers every queued event, in publishing order."""
+        while True:
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            callback(*args)
+
+    def _deliver(self, event, payload):
+        with self._lock:
+            handlers = list(self._handlers.get(event, ())) # Handlers may (un)subscribe while running
+        for handler in handlers:
+            handler(**payload)
+
+
+class TkEventBridge:
+    """
+    Delivers an EventBus's events on the Tk main loop. Publishing threads only queue the event
+    and post a virtual event; Tk then dispatches the queue as soon as it is idle, without polling.
+    If a wake-up cannot be posted (e.g. a Tcl built without thread support rejects calls from
+    worker threads), the failure is logged and a slow safety-net poll on the Tk thread (which
+    only does work when events are left queued) delivers them instead.
+    """
+
+    def __init__(self, root, bus):
+        self.root = root
+        self.bus = bus
+        self.polling = False # Set once a wake-up failed: events then wait for the safety-net poll
+        self._closed = False
+        root.bind(TK_VIRTUAL_EVENT, self._on_wake)
+        root.bind("<Destroy>", self._on_destroy, add="+")
+        bus.waker = self._wake
+        self._poll()
+
+    def _wake(self):
+        if self.polling or self._closed:
+            return # The safety-net poll picks the event up (or the app is closing)
+        try:
+            # Safe from worker threads: tkinter forwards the call to the Tcl thread
+            self.root.event_generate(TK_VIRTUAL_EVENT, when="tail")
+        except Exception as e: # TclError/RuntimeError
+            if not self._closed:
+                print(f"Could not wake the Tk loop for game events ({e}); polling every {FALLBACK_POLL_MS}ms instead")
+                self.polling = True
+
+    def _poll(self):
+        if self._closed:
+            return
+        if self.bus.has_pending():
+            self.bus.dispatch_pending()
+        self.root.after(FALLBACK_POLL_MS, self._poll)
+
+    def _on_wake(self, event=None):
+        self.bus.dispatch_pending()
+
+    def _on_destroy(self, event):
+        if event.widget is self.root:
+            self._closed = True
@@ -1,16 +1,47 @@
+import os
 import math
 import time # To time AI calculations
-# Assuming ai.py now contains the versions WITHOUT depth limit
-from ai import minimax, alphabeta, GameState
+from collections import deque
+from ai import search, outcome_of, StatePool, StreamingGameState, StateBudgetExceeded, SearchBudget
+from game_record import GameRecord, RECORD_DIR, record_path
+from solution_cache import canonical_key
+from engine_select import auto_search, iterative_deepening, predict_tree_size, DEFAULT_TIME_BUDGET, DEFAULT_SELECTION_LOG
+from state_codec import encode_snapshot, decode_snapshot, replay
+from opponent_model import load_model
+from events import MOVE_APPLIED, SEARCH_STARTED, SEARCH_PROGRESS, SEARCH_FINISHED, GAME_OVER, PROGRESS_INTERVAL
+
+METRICS_WINDOW = 50        # Recent AI moves kept for live performance stats
+DEFAULT_LATENCY_SLO = 0.5  # Seconds an AI move may take before it is logged as a violation
+DEFAULT_MAX_TREE_STATES = 500_000        # Distinct states materialized before switching to streaming
+DEFAULT_SEARCH_NODES = 500_000           # Per-move node budget of searches on the materialized tree
+DEFAULT_STREAMING_SEARCH_NODES = 200_000 # Per-move node budget when the tree is streamed
+DEEPENING_ALGORITHMS = ('minimax', 'alphabeta', 'outcome') # Searches deepened iteratively when over budget
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(pct * len(ordered) / 100)))
+    return ordered[rank - 1]
+
 
 class Game:
     """Manages the game flow, state transitions, and AI interaction."""
 
-    def __init__(self, settings):
-        """Initializes the game based on user settings."""
+    def __init__(self, settings, solution_cache=None, events=None):
+        """
+        Initializes the game based on user settings.
+        solution_cache: Optional SolutionCache shared across games to skip already solved positions.
+        events: Optional EventBus; moves, AI searches and the end of the game are published on it.
+        """
         self.settings = settings
+        self.solution_cache = solution_cache
+        self.events = events
+        self.closed = False # Set by close(): no more events, and a late AI result is dropped
         self.current_state = None # Holds the current GameState object
-        self.algorithm = settings.get('algorithm') # 'minimax' or 'alphabeta'
+        self.algorithm = settings.get('algorithm') # 'minimax', 'alphabeta', 'auto' or 'expectimax'
         self.mode = settings.get('mode') # 'AI' or '1v1'
         # Determine the first player (1 for player/player1, 2 for ai/player2)
         self.turn = 1 if settings.get('starting_player') in ['player', 'player1'] else 2
@@ -20,22 +51,79 @@ class Game:
         self.total_moves = 0
         self.total_ai_time = 0.0
         self.total_nodes_explored = 0
+        self.cache_hits = 0    # AI moves answered from the solution cache
+        self.cache_lookups = 0 # AI moves that consulted the solution cache
         self.winner = None # To store winner ('Player', 'AI', 'Player 1', 'Player 2', 'Draw')
         self.starting_player = settings.get('starting_player')
+        self.record = None # GameRecord of the moves played so far
+        self.state_pool = None # Interning pool for this game's GameState nodes
+        self.tree_nodes = 0    # Distinct states materialized for this game
+        # Ring buffer of per-move AI metrics: n, latency, nodes, nodes_per_s, cache_hit
+        self.move_metrics = deque(maxlen=settings.get('metrics_window', METRICS_WINDOW))
+        self.latency_slo = settings.get('latency_slo', DEFAULT_LATENCY_SLO) # Seconds (None disables)
+        self.slo_violations = [] # (n, latency) of AI moves slower than the SLO
+        self.verbose = settings.get('verbose', True) # Print AI progress messages to stdout
+        self.depth_limit = settings.get('depth_limit') # Plies searched per AI move (None = full search)
+        self.heuristic_mode = settings.get('heuristic', 'static') # Evaluation of cut-off states: 'static' or 'tuned'
+        self.time_budget = settings.get('time_budget', DEFAULT_TIME_BUDGET) # Seconds per move in 'auto' mode
+        self.selection_log = settings.get('selection_log', DEFAULT_SELECTION_LOG) # Path logging each 'auto' decision (None = off)
+        # Memory/node budgets: cap on materialized states, and on nodes searched per move
+        # (None = the default for the tree kind, see effective_search_budget; 0 = unlimited)
+        self.max_tree_states = settings.get('max_tree_states', DEFAULT_MAX_TREE_STATES)
+        self.search_node_budget = settings.get('search_node_budget')
+        self.streaming = False   # True once the tree is streamed instead of materialized
+        self.degradations = []   # Human-readable notes on what was given up to stay within budget
+        # Expectimax: how the human is expected to move ('uniform' or 'fitted'), and its per-game memo
+        self.opponent_model = load_model(settings.get('opponent_model', 'uniform')) if self.algorithm == 'expectimax' else None
+        self.expectimax_memo = {}
 
-    def select_number(self, number):
-        """Sets the starting number and creates the initial game state."""
+    def select_number(self, number, position=None):
+        """
+        Sets the starting number and creates the initial game state.
+        position: Optional state reached later in this game (see restore); the tree is then
+                  built from that position instead of from the starting number.
+        """
         self.initial_number = number
-        # Create the root GameState
-        self.current_state = GameState(number, 0, 0, 0, self.turn, self.original_turn)
+        self.degradations = []
+        self.expectimax_memo = {}
+        # Parameters of the state the tree is built from, with its key as reached in play
+        if position is None:
+            root = (number, 0, 0, 0, self.turn, self.original_turn, None, None)
+        else:
+            root = (position.n, position.cp, position.pp, position.b, position.turn, self.original_turn,
+                    position.key, position.remaining)
+        # Create the root GameState; identical states reached by different move orders share one node
+        self.state_pool = StatePool(self.max_tree_states)
+        try:
+            self.current_state = self.state_pool.intern(*root)
+            self.tree_nodes = len(self.state_pool)
+            self.streaming = False
+        except StateBudgetExceeded as e:
+            # Too big to hold in memory: stream states on demand and cap every search
+            self.release_state_pool()
+            self.current_state = StreamingGameState(*root)
+            self.tree_nodes = 0
+            self.streaming = True
+            self.report_degradation(f"Full tree not materialized ({e}); streaming states and "
+                                    f"limiting each search to {self.effective_search_budget():,} nodes")
+            self.shrink_caches()
         # Reset game statistics
         self.total_moves = 0
         self.total_ai_time = 0.0
         self.total_nodes_explored = 0
+        self.cache_hits = 0
+        self.cache_lookups = 0
+        self.move_metrics.clear()
+        self.slo_violations = []
         self.winner = None
+        # Start a fresh move record for this game
+        self.record = GameRecord(number, self.original_turn, self.mode, self.algorithm)
 
-    def make_move(self, divisor):
-        """Applies a move (dividing by 2 or 3) to the current game state."""
+    def make_move(self, divisor, ai_time=None, nodes=0):
+        """
+        Applies a move (dividing by 2 or 3) to the current game state.
+        ai_time/nodes are the search statistics when the move was chosen by the AI.
+        """
         next_state = None
         # Retrieve the pre-calculated child state corresponding to the divisor
         if divisor == 2 and self.current_state.left:
@@ -45,42 +133,108 @@ class Game:
 
         self.current_state = next_state # Update the game state
         self.total_moves += 1
+        self.record.add_ply(divisor, next_state, ai_time, nodes) # Keep the move for replay
         # Update whose turn it is based on the new state (could be None if terminal)
         self.turn = self.current_state.turn
+        self.publish(MOVE_APPLIED, divisor=divisor, state=next_state, by_ai=ai_time is not None)
 
         if self.current_state.terminal(): # Check if the game ended
             self.determine_winner()
 
     def computer_move(self):
-        """Calculates and performs the AI's move using unlimited depth search."""
+        """Calculates and performs the AI's move with the selected algorithm."""
+        result = self.find_computer_move()
+        return self.apply_computer_move(*result) if result is not None else None
+
+    def find_computer_move(self):
+        """
+        Searches for the AI's move without applying it, so the search can run on a worker thread
+        while the front end keeps using the game; apply_computer_move then runs on its thread.
+        Returns the arguments of apply_computer_move, or None if there is no move to make.
+        """
         if not self.current_state or self.current_state.terminal():
             return None # No move if game over or not started
 
-        # Determine if the AI is the maximizing player from the heuristic's perspective
-        is_maximizing_perspective = (self.turn == self.original_turn)
-
-        # No depth limit parameters needed for the calls anymore
-        # depth = 8 # REMOVED - No longer used
-        divisor = None
-        nodes = 0
         start_time = time.perf_counter() # Start timing
 
-        print(f"AI ({self.algorithm}) thinking from N={self.current_state.n}...") # Add thinking message
+        if self.verbose: print(f"AI ({self.algorithm}) thinking from N={self.current_state.n}...") # Add thinking message
+        self.publish(SEARCH_STARTED, n=self.current_state.n, algorithm=self.algorithm)
 
-        # --- MODIFIED CALLS ---
-        if self.algorithm == 'alphabeta':
-            # Call alphabeta without depth/max_depth
-            _, divisor, nodes = alphabeta(self.current_state, -math.inf, math.inf, is_maximizing_perspective)
-        else: # Default to minimax
-            # Call minimax without depth/max_depth
-            _, divisor, nodes = minimax(self.current_state, is_maximizing_perspective)
-        # --- END MODIFIED CALLS ---
+        if self.algorithm == 'auto':
+            # Picks forced move / cache / alpha-beta / anytime search from the predicted tree size
+            _, divisor, nodes, engine = auto_search(self.current_state, self.solution_cache,
+                                                    self.time_budget, self.heuristic_mode, self.selection_log)
+            if self.verbose: print(f"Auto mode used: {engine}")
+            cache_lookup = self.solution_cache is not None and engine not in ('forced', 'table')
+            move_time = time.perf_counter() - start_time
+            return divisor, move_time, nodes, engine == 'cache', cache_lookup
+
+        # Positions recur across games, so try the shared cache before searching
+        cache_key = None
+        cached = None
+        # Depth-limited results are estimates, so only exact searches use the cache.
+        # Expectimax values depend on the opponent model; its own memo plays the cache's role.
+        if self.solution_cache is not None and self.depth_limit is None and self.algorithm != 'expectimax':
+            cache_key = canonical_key(self.current_state, self.algorithm)
+            cached = self.solution_cache.get(cache_key)
+
+        if cached is not None:
+            _, divisor = cached
+            nodes = 0
+        else:
+            max_nodes = self.effective_search_budget()
+            # Listeners get a SEARCH_PROGRESS event every PROGRESS_INTERVAL nodes. Counting costs
+            # a call per node, so it is skipped for trees too small to ever report progress.
+            on_progress = None
+            if self.events is not None and predict_tree_size(self.current_state.n) > PROGRESS_INTERVAL:
+                on_progress = self.report_search_progress
+            budget = None
+            if max_nodes is not None or on_progress is not None:
+                budget = SearchBudget(max_nodes, on_progress, PROGRESS_INTERVAL)
+            if self.needs_deepening(max_nodes):
+                # The tree may not fit in the budget. One search would spend it all in the first
+                # root move and only estimate the other, so deepen: every depth compares both moves.
+                maximizing = (self.current_state.turn == self.current_state.original_turn)
+                value, divisor, nodes, depth = iterative_deepening(self.current_state, maximizing,
+                                                                   mode=self.heuristic_mode, budget=budget)
+                if self.algorithm == 'outcome':
+                    value = outcome_of(value)
+                exact = depth >= self.current_state.remaining
+                if not exact:
+                    self.report_degradation(f"Search node budget of {max_nodes:,} reached at N={self.current_state.n}: "
+                                            f"searched {depth} plies ahead, move may be suboptimal")
+            else:
+                # The AI maximizes when it is the original starter (handled inside search)
+                value, divisor, nodes = search(self.current_state, self.algorithm, self.depth_limit,
+                                               self.heuristic_mode, budget, self.opponent_model, self.expectimax_memo)
+                exact = budget is None or not budget.exhausted
+                if not exact:
+                    self.report_degradation(f"Search node budget of {max_nodes:,} reached at N={self.current_state.n}: "
+                                            f"{budget.cutoffs:,} positions estimated statically, move may be suboptimal")
+            # Estimates stay out of the cache
+            if exact and cache_key is not None and divisor is not None:
+                self.solution_cache.put(cache_key, value, divisor)
 
-        # Record performance statistics
         move_time = time.perf_counter() - start_time
+        return divisor, move_time, nodes, cached is not None, cache_key is not None
+
+    def apply_computer_move(self, divisor, move_time, nodes, cache_hit=False, cache_lookup=False):
+        """
+        Records the statistics of an AI search and applies its chosen move.
+        Also used when the search itself ran elsewhere (e.g. in a server worker process).
+        cache_lookup: The search consulted this game's solution cache (counted in cache_hit_rate).
+        """
+        if self.closed:
+            return None # The game was left while the AI was still thinking
+        # Record performance statistics
+        if cache_lookup:
+            self.cache_lookups += 1
+            self.cache_hits += cache_hit
         self.total_ai_time += move_time
         self.total_nodes_explored += nodes
-        print(f"AI calculation took: {move_time:.4f}s, explored {nodes:,} nodes.") # Add timing/node info
+        self.record_move_metrics(self.current_state.n, move_time, nodes, cache_hit)
+        if self.verbose: print(f"AI calculation took: {move_time:.4f}s, explored {nodes:,} nodes.") # Add timing/node info
+        self.publish(SEARCH_FINISHED, divisor=divisor, ai_time=move_time, nodes=nodes, cache_hit=cache_hit)
 
         # Check if a valid move was found
         if divisor is None:
@@ -90,10 +244,125 @@ class Game:
                  self.determine_winner() # Ensure winner is determined if game should have ended
             return None
 
-        print(f"AI chooses to divide by {divisor}") # Announce AI move
-        self.make_move(divisor) # Apply the AI's chosen move
+        if self.verbose: print(f"AI chooses to divide by {divisor}") # Announce AI move
+        self.make_move(divisor, move_time, nodes) # Apply the AI's chosen move
         return divisor # Return the divisor used
 
+    def record_move_metrics(self, n, latency, nodes, cache_hit):
+        """Adds one AI move to the metrics ring buffer and logs it if it breaks the latency SLO."""
+        self.move_metrics.append({
+            'n': n, 'latency': latency, 'nodes': nodes,
+            'nodes_per_s': nodes / latency if latency > 0 else 0.0,
+            'cache_hit': cache_hit,
+        })
+        if self.latency_slo is not None and latency > self.latency_slo:
+            self.slo_violations.append((n, latency))
+            print(f"SLO violation: AI move from N={n} took {latency:.4f}s "
+                  f"(SLO {self.latency_slo:.4f}s, {nodes:,} nodes, algorithm {self.algorithm})")
+
+    def performance_summary(self):
+        """One-line summary of the recent AI moves for the live overlay."""
+        if not self.move_metrics:
+            return "AI perf: no moves yet"
+        latencies = [m['latency'] for m in self.move_metrics]
+        nodes_per_s = sum(m['nodes'] for m in self.move_metrics) / max(sum(latencies), 1e-9)
+        hits = sum(1 for m in self.move_metrics if m['cache_hit'])
+        return (f"AI perf (last {len(latencies)}): p50 {percentile(latencies, 50) * 1000:.1f}ms  "
+                f"p95 {percentile(latencies, 95) * 1000:.1f}ms  max {max(latencies) * 1000:.1f}ms  "
+                f"{nodes_per_s:,.0f} nodes/s  cache hits {hits}/{len(latencies)}  "
+                f"SLO misses {len(self.slo_violations)}")
+
+    def effective_search_budget(self):
+        """Node budget for one search: the configured one, else the default for the tree kind (None = unlimited)."""
+        if self.search_node_budget is not None:
+            return self.search_node_budget or None
+        return DEFAULT_STREAMING_SEARCH_NODES if self.streaming else DEFAULT_SEARCH_NODES
+
+    def needs_deepening(self, max_nodes):
+        """True when a full-depth search could overrun the node budget (the predicted tree size is an upper bound)."""
+        return (max_nodes is not None and self.depth_limit is None and self.algorithm in DEEPENING_ALGORITHMS
+                and predict_tree_size(self.current_state.n) > max_nodes)
+
+    def report_degradation(self, message):
+        """Logs and keeps a note of something given up to stay within the memory/node budget."""
+        self.degradations.append(message)
+        print(f"Budget: {message}")
+
+    def shrink_caches(self):
+        """Halves the shared solution cache when the game has to stream its tree (memory is short)."""
+        if self.solution_cache is not None:
+            self.solution_cache.shrink(0.5)
+
+    def release_state_pool(self):
+        """Frees the per-game interning pool (the current state stays valid)."""
+        if self.state_pool is not None:
+            self.state_pool.clear()
+            self.state_pool = None
+
+    def cache_hit_rate(self):
+        """Fraction of AI moves answered from the solution cache (0.0 when it was never used)."""
+        return self.cache_hits / self.cache_lookups if self.cache_lookups else 0.0
+
+    def publish(self, event, **payload):
+        """Publishes a game event (see events.py) if an event bus is attached."""
+        if self.events is not None and not self.closed:
+            self.events.publish(event, game=self, **payload)
+
+    def report_search_progress(self, nodes):
+        self.publish(SEARCH_PROGRESS, nodes=nodes)
+
+    def close(self):
+        """Detaches the game from its front end: stops events and ignores a search still running."""
+        self.closed = True
+
+    def save_record(self, directory=RECORD_DIR):
+        """Writes the move record of this game to `directory`. Returns the file path (None if nothing to save)."""
+        if not self.record or not self.record.plies:
+            return None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = record_path(self.initial_number, directory)
+            self.record.save(path)
+            return path
+        except OSError as e:
+            print(f"Error saving game record: {e}")
+            return None
+
+    def snapshot(self):
+        """
+        Compact bytes of the game so far: starting number, who started, the move path and the
+        AI totals (see state_codec). A few dozen bytes whatever the size of the game tree.
+        """
+        plies = self.record.plies if self.record else []
+        return encode_snapshot(self.initial_number, self.original_turn,
+                               [ply.divisor for ply in plies], [ply.is_ai for ply in plies],
+                               self.total_ai_time, self.total_nodes_explored)
+
+    def restore(self, snapshot):
+        """
+        Resumes a game from Game.snapshot() bytes. The move path is replayed without building
+        any subtree, then only the tree below the current position is materialized.
+        Per-move metrics and recorded AI timings of the earlier plies are not kept.
+        Raises ValueError if the snapshot is malformed or contains an illegal move.
+        """
+        initial_number, original_turn, divisors, ai_plies, total_ai_time, total_nodes = decode_snapshot(snapshot)
+        path = replay(initial_number, original_turn, divisors)
+        self.turn = self.original_turn = original_turn
+        # Who started, in the settings' terms: the human/player 1 is turn 1 (see __init__)
+        if self.mode == 'AI':
+            self.starting_player = 'player' if original_turn == 1 else 'ai'
+        else:
+            self.starting_player = 'player1' if original_turn == 1 else 'player2'
+        self.select_number(initial_number, path[-1] if path else None)
+        for divisor, state, is_ai in zip(divisors, path, ai_plies):
+            self.record.add_ply(divisor, state, 0.0 if is_ai else None)
+        self.total_moves = len(divisors)
+        self.total_ai_time = total_ai_time
+        self.total_nodes_explored = total_nodes
+        self.turn = self.current_state.turn
+        if self.current_state.terminal():
+            self.determine_winner()
+
     def get_game_state(self):
         """Returns the current GameState object."""
         return self.current_state
@@ -101,6 +370,7 @@ class Game:
     def determine_winner(self):
         """Determines the winner based on the final scores in the terminal state."""
         if self.winner is not None: return # Avoid re-determining
+        self.release_state_pool() # No more states will be looked up for this game
 
         state = self.current_state
         # Check if state is valid before accessing attributes
@@ -135,4 +405,5 @@ class Game:
             else: # Draw
                 self.winner = "Draw"
         else: # 1v1 mode uses 'Player 1' / 'Player 2'
-            self.winner = winner_label
\ No newline at end of file
+            self.winner = winner_label
+        self.publish(GAME_OVER, winner=self.winner)
\ No newline at end of file
@@ -0,0 +1,201 @@
+import os
+import glob
+import struct
+import time
+import argparse
+from collections import namedtuple
+from ai import GameState, search, ALGORITHMS
+
+RECORD_DIR = "game_records"   # Directory where finished game records are stored
+RECORD_EXTENSION = ".ndgr"    # File extension for Number Division Game Records
+RECORD_MAGIC = b"NDGR"        # Identifies a game record file
+RECORD_VERSION = 2            # Bumped whenever the binary layout changes (version 1 is still read)
+
+# Numbers have no size limit, so each file stores them in the byte width of its initial number
+# (no number in a game is larger). Plies keep a fixed size and any ply is still one seek away.
+# Header: magic, version, original turn, mode, algorithm, ply count, number width, then the
+# initial number in that many bytes
+HEADER_FORMAT = "<4sBB4s16sIB"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+# Ply: divisor, n (number width bytes), then cp, pp, b, turn (0 = none), is_ai, ai_time (s), nodes explored
+PLY_FIELDS_FORMAT = "<HHHBBdQ"
+PLY_FIELDS_SIZE = struct.calcsize(PLY_FIELDS_FORMAT)
+# Version 1: the same plies with 8-byte numbers, after a header holding the number as a 64-bit field
+V1_HEADER_FORMAT = "<4sBQB4s16sI"
+V1_HEADER_SIZE = struct.calcsize(V1_HEADER_FORMAT)
+V1_NUMBER_WIDTH = 8
+
+# One applied move plus the state snapshot reached after it
+PlyRecord = namedtuple("PlyRecord", ["divisor", "n", "cp", "pp", "b", "turn", "is_ai", "ai_time", "nodes"])
+
+
+class GameRecord:
+    """In-memory move sequence of one game, written to disk in a fixed-size binary layout."""
+
+    def __init__(self, initial_number, original_turn, mode, algorithm):
+        """
+        initial_number: Starting number of the game.
+        original_turn: Player who started the game (1 or 2).
+        mode: 'AI' or '1v1'.
+        algorithm: AI algorithm name (None in 1v1 mode).
+        """
+        self.initial_number = initial_number
+        self.original_turn = original_turn
+        self.mode = mode
+        self.algorithm = algorithm
+        self.plies = []
+
+    def add_ply(self, divisor, state, ai_time=None, nodes=0):
+        """Appends a move and the state it produced. ai_time is None for human moves."""
+        self.plies.append(PlyRecord(
+            divisor, state.n, state.cp, state.pp, state.b,
+            state.turn or 0, # Terminal states have no player to move
+            1 if ai_time is not None else 0,
+            ai_time if ai_time is not None else 0.0,
+            nodes,
+        ))
+
+    def save(self, path):
+        """Writes the record to `path` (header followed by fixed-size ply entries)."""
+        width = max(1, (self.initial_number.bit_length() + 7) // 8)
+        header = struct.pack(
+            HEADER_FORMAT, RECORD_MAGIC, RECORD_VERSION, self.original_turn,
+            (self.mode or "").encode("ascii"), (self.algorithm or "").encode("ascii"), len(self.plies), width,
+        ) + self.initial_number.to_bytes(width, 'little')
+        with open(path, 'wb') as f:
+            f.write(header)
+            for ply in self.plies:
+                f.write(bytes((ply.divisor,)) + ply.n.to_bytes(width, 'little')
+                        + struct.pack(PLY_FIELDS_FORMAT, *ply[2:]))
+
+
+class RecordReader:
+    """Random-access reader for a game record file. Any ply can be read with a single seek."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._read_header()
+        except ValueError:
+            self._file.close()
+            raise
+
+    def _read_header(self):
+        prefix = self._file.read(5) # Magic and version: the header layout depends on the version
+        if len(prefix) != 5:
+            raise ValueError(f"{self.path}: truncated game record header")
+        version = prefix[4]
+        if prefix[:4] != RECORD_MAGIC or version not in (1, RECORD_VERSION):
+            raise ValueError(f"{self.path}: not a version {RECORD_VERSION} game record")
+        size = V1_HEADER_SIZE if version == 1 else HEADER_SIZE
+        header = prefix + self._file.read(size - len(prefix))
+        if len(header) != size:
+            raise ValueError(f"{self.path}: truncated game record header")
+        if version == 1:
+            _, _, n, original_turn, mode, algorithm, ply_count = struct.unpack(V1_HEADER_FORMAT, header)
+            width = V1_NUMBER_WIDTH
+        else:
+            _, _, original_turn, mode, algorithm, ply_count, width = struct.unpack(HEADER_FORMAT, header)
+            number = self._file.read(width)
+            if len(number) != width:
+                raise ValueError(f"{self.path}: truncated game record header")
+            n = int.from_bytes(number, 'little')
+        self.number_width = width
+        self.plies_offset = self._file.tell()
+        self.ply_size = 1 + width + PLY_FIELDS_SIZE
+        self.initial_number = n
+        self.original_turn = original_turn
+        self.mode = mode.rstrip(b"\0").decode("ascii")
+        self.algorithm = algorithm.rstrip(b"\0").decode("ascii") or None
+        self.ply_count = ply_count
+
+    def __len__(self):
+        return self.ply_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def seek_ply(self, index):
+        """Returns the PlyRecord at `index` without reading the plies before it."""
+        if not 0 <= index < self.ply_count:
+            raise IndexError(f"ply {index} out of range (game has {self.ply_count} plies)")
+        self._file.seek(self.plies_offset + index * self.ply_size)
+        data = self._file.read(self.ply_size)
+        if len(data) != self.ply_size:
+            raise ValueError(f"{self.path}: truncated ply {index}")
+        n = int.from_bytes(data[1:1 + self.number_width], 'little')
+        return PlyRecord(data[0], n, *struct.unpack_from(PLY_FIELDS_FORMAT, data, 1 + self.number_width))
+
+    def __iter__(self):
+        for index in range(self.ply_count):
+            yield self.seek_ply(index)
+
+    def state_before(self, index):
+        """Rebuilds the GameState the player faced when choosing ply `index`."""
+        if index == 0:
+            return GameState(self.initial_number, 0, 0, 0, self.original_turn, self.original_turn)
+        prev = self.seek_ply(index - 1)
+        return GameState(prev.n, prev.cp, prev.pp, prev.b, prev.turn or None, self.original_turn)
+
+
+def record_path(initial_number, directory=RECORD_DIR):
+    """Builds a unique file name for a new record inside `directory`."""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    micros = time.time_ns() // 1000 % 1_000_000 # Keeps names unique within the same second
+    return os.path.join(directory, f"{stamp}-{micros:06d}-{initial_number}{RECORD_EXTENSION}")
+
+
+def reevaluate_records(paths, algorithm):
+    """
+    Replays every AI ply of the given records against the current engine.
+    Returns a summary comparing recorded and fresh moves, node counts and timings.
+    """
+    summary = {
+        'games': 0, 'ai_plies': 0, 'move_changes': 0, 'skipped': 0,
+        'recorded_nodes': 0, 'new_nodes': 0, 'recorded_time': 0.0, 'new_time': 0.0,
+    }
+    for path in paths:
+        try:
+            reader = RecordReader(path)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {path}: {e}")
+            summary['skipped'] += 1
+            continue
+        with reader:
+            summary['games'] += 1
+            for index, ply in enumerate(reader):
+                if not ply.is_ai:
+                    continue # Only AI decisions are re-evaluated
+                state = reader.state_before(index)
+                start_time = time.perf_counter()
+                _, divisor, nodes = search(state, algorithm)
+                summary['new_time'] += time.perf_counter() - start_time
+                summary['new_nodes'] += nodes
+                summary['recorded_time'] += ply.ai_time
+                summary['recorded_nodes'] += ply.nodes
+                summary['ai_plies'] += 1
+                if divisor != ply.divisor:
+                    summary['move_changes'] += 1
+    return summary
+
+
+# --- Batch Re-evaluation Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-evaluate stored game records against the current AI.")
+    parser.add_argument("paths", nargs="*", help=f"Record files (default: all in {RECORD_DIR}/)")
+    parser.add_argument("--algorithm", default="alphabeta", choices=ALGORITHMS, help="Engine to evaluate with")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(RECORD_DIR, "*" + RECORD_EXTENSION)))
+    result = reevaluate_records(paths, args.algorithm)
+    print(f"Games: {result['games']:,} (skipped {result['skipped']}), AI plies: {result['ai_plies']:,}")
+    print(f"Move changes: {result['move_changes']:,}")
+    print(f"Nodes: recorded {result['recorded_nodes']:,} -> new {result['new_nodes']:,}")
+    print(f"Time:  recorded {result['recorded_time']:.4f}s -> new {result['new_time']:.4f}s")
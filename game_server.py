@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import asyncio
+import struct
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from ai import search, outcome_of, ALGORITHMS, StatePool, StreamingGameState, StateBudgetExceeded, SearchBudget
+from engine_select import auto_search, iterative_deepening, predict_tree_size, DEFAULT_SELECTION_LOG
+from game_logic import (Game, DEFAULT_MAX_TREE_STATES, DEFAULT_SEARCH_NODES, DEFAULT_STREAMING_SEARCH_NODES,
+                        DEEPENING_ALGORITHMS)
+from solution_cache import SolutionCache, canonical_key, key_for
+from state_key import remaining_depth
+from state_codec import encode_position, decode_position, pack_solutions, unpack_solutions, MAX_NUMBER
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_CACHED_SOLUTIONS = 100_000 # Positions kept in the cross-session solution cache
+# Longest game a session may start: trees are built and searched recursively, a few stack
+# frames per move, so deeper numbers would overflow the interpreter's recursion limit
+MAX_GAME_MOVES = 150
+
+
+def _worker_search(position, algorithm, selection_log=None):
+    """
+    Runs one AI search inside a pool worker. The position arrives as state_codec bytes.
+    Like Game, the tree is interned up to DEFAULT_MAX_TREE_STATES and streamed beyond, and the
+    search is capped by the node budget of that tree kind, deepening iteratively when the tree
+    may not fit, so a worker's time and memory stay bounded whatever the number.
+    Returns (value, divisor, nodes, search_time, exact, solved) where exact is False for
+    estimates cut off by the budget and solved packs the positions below that the search
+    itself proved exactly (minimax and alphabeta only; the others break ties along their
+    search path). selection_log: Where 'auto' appends its decision (None = off).
+    """
+    start_time = time.perf_counter()
+    state = decode_position(position, StreamingGameState) # The position alone, no subtree yet
+    try:
+        state = StatePool(DEFAULT_MAX_TREE_STATES).intern(state.n, state.cp, state.pp, state.b,
+                                                          state.turn, state.original_turn)
+        max_nodes = DEFAULT_SEARCH_NODES
+    except StateBudgetExceeded:
+        max_nodes = DEFAULT_STREAMING_SEARCH_NODES # Too big to hold: search the streamed tree
+    budget = SearchBudget(max_nodes)
+    solutions = None
+    if algorithm == 'auto':
+        # Within its own time budget. Only its alpha-beta tier is exact: forced moves have no
+        # value, the table only an outcome and deepening an estimate.
+        value, divisor, nodes, engine = auto_search(state, log_path=selection_log)
+        exact = engine == 'alphabeta'
+    elif algorithm in DEEPENING_ALGORITHMS and predict_tree_size(state.n) > max_nodes:
+        maximizing = (state.turn == state.original_turn)
+        value, divisor, nodes, depth = iterative_deepening(state, maximizing, budget=budget)
+        if algorithm == 'outcome':
+            value = outcome_of(value)
+        exact = depth >= state.remaining
+    else:
+        solutions = {} if algorithm in ('minimax', 'alphabeta') else None
+        value, divisor, nodes = search(state, algorithm, budget=budget, solutions=solutions)
+        exact = not budget.exhausted
+    search_time = time.perf_counter() - start_time
+    solved = pack_solutions(solutions) if solutions else b""
+    return value, divisor, nodes, search_time, exact, solved
+
+
+def state_to_dict(state):
+    """JSON-friendly view of a GameState."""
+    return {
+        'n': state.n, 'cp': state.cp, 'pp': state.pp, 'b': state.b,
+        'turn': state.turn, 'terminal': state.terminal(),
+    }
+
+
+class GameServer:
+    """
+    Serves many Game sessions over JSON lines (one session per connection).
+    AI searches run in a bounded process pool and share one solution cache.
+    """
+
+    def __init__(self, max_workers=None, selection_log=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.selection_log = selection_log # Path logging each 'auto' decision (None = off)
+        self.pool = None # Created in start() so the server object can be built outside the event loop
+        # Only max_workers searches are submitted at a time. asyncio.Semaphore wakes waiters in
+        # FIFO order and a session never has more than one search queued (requests on a
+        # connection are handled one by one), so sessions are served round-robin.
+        self.search_slots = None
+        self.solutions = SolutionCache(path=None, max_entries=MAX_CACHED_SOLUTIONS) # Shared by all sessions
+        self.inflight = {} # Same key -> Future of a search already running for another session
+        self.active_sessions = 0
+        self.cache_hits = 0
+        self.searches = 0
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        """Starts listening on TCP (host, port) or on a Unix socket when unix_path is given."""
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.search_slots = asyncio.Semaphore(self.max_workers)
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def handle_client(self, reader, writer):
+        """Runs one game session for the lifetime of the connection."""
+        self.active_sessions += 1
+        game = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break # Client disconnected
+                request = None
+                try:
+                    request = json.loads(line)
+                    response, game = await self.handle_request(request, game)
+                except (ValueError, KeyError, TypeError, struct.error, RecursionError) as e:
+                    response = {'ok': False, 'error': str(e)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+                if isinstance(request, dict) and request.get('op') == 'quit':
+                    break
+        except ConnectionError:
+            pass # Client went away mid-request
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+
+    async def handle_request(self, request, game):
+        """Dispatches one request. Returns (response, game) since 'new' replaces the session's game."""
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        op = request.get('op')
+        if op == 'new':
+            settings = {
+                'mode': request.get('mode', 'AI'),
+                'algorithm': request.get('algorithm', 'alphabeta'),
+                'starting_player': request.get('starting_player', 'player'),
+                'verbose': False, # Many sessions would flood stdout
+            }
+            if settings['algorithm'] not in ALGORITHMS:
+                raise ValueError(f"unknown algorithm {settings['algorithm']!r}")
+            number = int(request['number'])
+            if not 1 <= number <= MAX_NUMBER:
+                raise ValueError(f"number must be between 1 and 2^{MAX_NUMBER.bit_length()} - 1")
+            if remaining_depth(number) > MAX_GAME_MOVES:
+                raise ValueError(f"a game from {number} could last {remaining_depth(number)} moves "
+                                 f"(at most {MAX_GAME_MOVES} supported)")
+            game = Game(settings)
+            game.select_number(number)
+            return self.session_response(game), game
+        if op == 'quit':
+            return {'ok': True}, game
+        if op == 'stats':
+            return {
+                'ok': True, 'sessions': self.active_sessions, 'searches': self.searches,
+                'cache_hits': self.cache_hits, 'cached_positions': len(self.solutions),
+            }, game
+        if game is None:
+            raise ValueError("no game in this session; send {'op': 'new'} first")
+        if op == 'state':
+            return self.session_response(game), game
+        if game.current_state.terminal():
+            raise ValueError("game is over")
+        if op == 'move':
+            divisor = int(request['divisor'])
+            state = game.current_state
+            if (divisor == 2 and not state.left) or (divisor == 3 and not state.right) or divisor not in (2, 3):
+                raise ValueError(f"cannot divide {state.n} by {divisor}")
+            game.make_move(divisor)
+            return self.session_response(game), game
+        if op == 'ai':
+            divisor, nodes, move_time, cached = await self.solve(game)
+            game.apply_computer_move(divisor, move_time, nodes, cached)
+            response = self.session_response(game)
+            response.update({'divisor': divisor, 'nodes': nodes, 'ai_time': move_time, 'cached': cached})
+            return response, game
+        raise ValueError(f"unknown op {op!r}")
+
+    def session_response(self, game):
+        return {'ok': True, 'state': state_to_dict(game.current_state), 'winner': game.winner}
+
+    async def solve(self, game):
+        """Finds the AI move for the session's current state. Returns (divisor, nodes, time, cached)."""
+        state = game.current_state
+        key = canonical_key(state, game.algorithm)
+
+        cached = self.solutions.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached[1], 0, 0.0, True
+
+        # Another session is already solving this exact position: wait for its answer
+        if key in self.inflight:
+            self.cache_hits += 1
+            _, divisor, _ = await asyncio.shield(self.inflight[key])
+            return divisor, 0, 0.0, True
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.inflight[key] = future
+        try:
+            async with self.search_slots:
+                value, divisor, nodes, move_time, exact, solved = await loop.run_in_executor(
+                    self.pool, _worker_search, encode_position(state), game.algorithm, self.selection_log,
+                )
+            self.searches += 1
+            # The whole solved subtree answers this session's (and others') later moves
+            if solved:
+                for state_key, (child_value, child_move) in unpack_solutions(solved).items():
+                    self.solutions.put(key_for(state_key, game.algorithm), child_value, child_move)
+            if exact and divisor is not None: # Estimates stay out of the cache
+                self.solutions.put(key, value, divisor)
+            future.set_result((value, divisor, nodes))
+            return divisor, nodes, move_time, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception() # Mark as retrieved when no other session is waiting
+            raise
+        finally:
+            del self.inflight[key]
+
+
+async def serve(host, port, unix_path, workers, selection_log):
+    server = GameServer(workers, selection_log)
+    listener = await server.start(host, port, unix_path)
+    where = unix_path or f"{host}:{port}"
+    print(f"Game server listening on {where} with {server.max_workers} search workers")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+# --- Server Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Number Division Game sessions over JSON lines.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, help="Search processes (default: CPU count)")
+    parser.add_argument("--selection-log", default=DEFAULT_SELECTION_LOG,
+                        help="Append each 'auto' decision to this JSON-lines file (default: off, see NDG_SELECTION_LOG)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.selection_log))
+    except KeyboardInterrupt:
+        pass
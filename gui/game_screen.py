@@ -1,5 +1,7 @@
 import customtkinter as ctk
 import random # For the number shaking animation effect
+import threading # The AI searches off the Tk thread
+from events import MOVE_APPLIED, SEARCH_STARTED, SEARCH_PROGRESS, GAME_OVER
 
 class GameScreen(ctk.CTkFrame):
     """UI Frame for the main game play area."""
@@ -11,13 +13,22 @@ class GameScreen(ctk.CTkFrame):
         self.configure(fg_color="#150B3C") # Background color
         self.create_widgets()
         self.bind("<Configure>", self.on_resize) # Bind resize event for dynamic font sizing
-        self._after_id = None # Stores ID for pending 'after' calls (e.g., AI delay)
+        self._ai_thinking = False # True while an AI search runs in the background
+        self._game_over = False   # Set by GAME_OVER; results show once the last move's animation ends
+        self.show_perf_overlay = False # Live AI performance overlay, toggled with F3
+        controller.bind("<F3>", self.toggle_perf_overlay)
+        # React to game events instead of timers (delivered on the Tk thread by TkEventBridge)
+        controller.events.subscribe(MOVE_APPLIED, self.on_move_applied)
+        controller.events.subscribe(SEARCH_STARTED, self.on_search_started)
+        controller.events.subscribe(SEARCH_PROGRESS, self.on_search_progress)
+        controller.events.subscribe(GAME_OVER, self.on_game_over)
 
         # --- Shaking Animation Variables ---
         self.shake_offset = 5    # Max pixel offset during shake
         self.shake_delay = 50    # Milliseconds between shake movements
         self.shake_count = 0     # Current shake step
         self.max_shakes = 6      # Total number of shake movements per animation
+        self.shaking = False     # True while the animation runs
 
     def create_widgets(self):
         """Creates and arranges all UI widgets on the game screen."""
@@ -61,6 +72,9 @@ class GameScreen(ctk.CTkFrame):
                                         width=250, height=50, hover_color="#4A1000")
         self.btn_end_game.place(relx=0.5, rely=0.85, anchor="center") # Button to manually end/view results
 
+        # --- Performance Overlay (hidden until enabled) ---
+        self.perf_label = ctk.CTkLabel(self, text="", font=("Consolas", 11), text_color="#9FE2BF")
+
     def on_resize(self, event):
         """Adjusts font sizes dynamically based on window dimensions."""
         width = self.winfo_width()
@@ -82,68 +96,83 @@ class GameScreen(ctk.CTkFrame):
         self.score_label_1.configure(font=("Jura", scores_font_size))
         self.score_label_2.configure(font=("Jura", scores_font_size))
         self.last_move_label.configure(font=("Jura", scores_font_size))
+        self.perf_label.configure(font=("Consolas", max(9, scores_font_size - 2)))
         self.btn_divide2.configure(font=("Jura", button_font_size))
         self.btn_divide3.configure(font=("Jura", button_font_size))
         self.btn_end_game.configure(font=("Jura", end_button_font_size))
 
     def handle_move(self, divisor):
-        """Processes a player's move (triggered by button press)."""
-        
+        """Processes a player's move (triggered by button press). The UI follows on MOVE_APPLIED."""
+        self.btn_divide2.configure(state="disabled") # No second click before the move is shown
+        self.btn_divide3.configure(state="disabled")
         self.controller.game.make_move(divisor) # Update game logic state
-        self.last_move_label.configure(text=f"Last move: / {divisor}") # Update UI
-        self.update_display() # Refresh all UI elements
-        self.start_shaking_number() # Trigger visual feedback
-
-        # Check if the move ended the game
-        if self.controller.game.current_state.terminal():
-            self.update_buttons() # Disable buttons
-            self.after(500, self.end_game) # Show results after a short delay
-            return
-
-        self.update_buttons() # Update button states for the next turn
-
-        # If playing against AI and it's now the AI's turn, trigger AI move
-        if self.controller.game.mode == 'AI' and self.controller.game.turn == 2:
-            self.computer_turn()
 
     def computer_turn(self):
-        """Initiates the AI's turn, showing a thinking message and disabling buttons."""
+        """Starts the AI's move in a background thread; its result arrives as events."""
         self.turn_label.configure(text="AI THINKING...") # Update turn indicator
         self.btn_divide2.configure(state="disabled") # Disable player input
         self.btn_divide3.configure(state="disabled")
-
-        # Cancel any previous pending 'after' calls to avoid duplicate AI moves
-        if self._after_id:
-            self.after_cancel(self._after_id)
-
-        # Schedule the actual AI calculation after a short delay (for visual feedback)
-        self._after_id = self.after(1000, self.perform_computer_move)
-
-    def perform_computer_move(self):
-        """Executes the AI move calculation and updates the UI."""
-
-        # Double-check if game ended while waiting for the 'after' delay
-        if self.controller.game.current_state.terminal():
-             self.end_game()
-             return
-
-        divisor = self.controller.game.computer_move() # Get AI's chosen move from game logic
+        if self._ai_thinking:
+            return # A search is already running
+        self._ai_thinking = True
+        # The window stays responsive while the AI searches
+        threading.Thread(target=self.search_in_background, args=(self.controller.game,), daemon=True).start()
+
+    def search_in_background(self, game):
+        """Worker thread: only searches. The move is applied to the game back on the Tk thread."""
+        try:
+            result = game.find_computer_move()
+        except Exception as e:
+            print(f"AI search failed: {e}")
+            result = None
+        if not game.closed:
+            self.controller.events.call_soon(self.apply_computer_move, game, result)
+
+    def apply_computer_move(self, game, result):
+        """Tk thread: applies the searched move; MOVE_APPLIED then updates the screen."""
+        if result is not None and game.apply_computer_move(*result) is not None:
+            return
+        # No move was applied (search failed or found none): leave the thinking state
+        if game is self.controller.game:
+            self._ai_thinking = False
+            self.update_display(game, game.current_state)
+            self.update_buttons(game, game.current_state)
+
+    # --- Game Event Handlers (events from other games, e.g. one that was left, are ignored) ---
+    def on_move_applied(self, game, divisor, state, by_ai):
+        """A move (human or AI) was applied: show it and start the AI if it is its turn."""
+        if game is not self.controller.game:
+            return
+        if by_ai:
+            self._ai_thinking = False
         self.last_move_label.configure(text=f"Last move: / {divisor}") # Update UI
-        self.update_display() # Refresh all elements
+        self.update_display(game, state) # Refresh all UI elements from the event's state
+        self.update_buttons(game, state) # Button states for the next turn (all disabled if the game ended)
         self.start_shaking_number() # Trigger visual feedback
+        # If playing against AI and it's now the AI's turn, trigger AI move
+        if not state.terminal() and game.mode == 'AI' and state.turn == 2:
+            self.computer_turn()
 
-        # Check if AI's move ended the game
-        if self.controller.game.current_state.terminal():
-            self.update_buttons() # Disable buttons
-            self.after(500, self.end_game) # Show results after delay
-        else:
-            self.update_buttons() # Re-enable player buttons for their turn
-            
-        self._after_id = None # Clear the pending task ID
+    def on_search_started(self, game, n, algorithm):
+        if game is self.controller.game:
+            self.turn_label.configure(text="AI THINKING...")
+
+    def on_search_progress(self, game, nodes):
+        if game is self.controller.game:
+            self.turn_label.configure(text=f"AI THINKING... {nodes:,} nodes")
 
-    def update_display(self):
-        """Refreshes all UI elements to reflect the current game state."""
-        state = self.controller.game.get_game_state()
+    def on_game_over(self, game, winner):
+        """Shows the results as soon as the last move's animation has finished."""
+        if game is not self.controller.game:
+            return
+        self._ai_thinking = False
+        self._game_over = True
+        self.update_buttons(game, game.current_state)
+        if not self.shaking:
+            self.end_game()
+
+    def update_display(self, game, state):
+        """Refreshes all UI elements to show `state` of `game` (e.g. from a MOVE_APPLIED event)."""
         if not state: return # Do nothing if game state isn't ready
 
         # Update number and bank displays
@@ -157,10 +186,10 @@ class GameScreen(ctk.CTkFrame):
         p2_score = state.cp if state.original_turn == 1 else state.pp
 
         # Update score labels and turn indicator based on game mode
-        if self.controller.game.mode == '1v1':
+        if game.mode == '1v1':
             self.score_label_1.configure(text=f"PLAYER 1: {state.pp}")
             self.score_label_2.configure(text=f"PLAYER 2: {state.cp}")
-            player_turn_text = '1' if self.controller.game.turn == 1 else '2'
+            player_turn_text = '1' if state.turn == 1 else '2'
             turn_text = f"PLAYER {player_turn_text}'S TURN" if not state.terminal() else "GAME OVER"
         else: # AI Mode
             # Determine which score belongs to the human player and which to the AI
@@ -175,17 +204,30 @@ class GameScreen(ctk.CTkFrame):
             self.score_label_1.configure(text=f"PLAYER: {player_actual_score}")
             self.score_label_2.configure(text=f"AI: {ai_actual_score}")
 
-            turn_text = "YOUR TURN" if self.controller.game.turn == 1 else "AI TURN"
+            turn_text = "YOUR TURN" if state.turn == 1 else "AI TURN"
             if state.terminal():
                  turn_text = "GAME OVER"
-            elif self.controller.game.turn == 2 and self._after_id: # Show thinking if AI turn is pending
+            elif state.turn == 2 and self._ai_thinking: # Show thinking while the AI searches
                 turn_text = "AI THINKING..."
 
         self.turn_label.configure(text=turn_text)
+        self.update_perf_overlay()
+
+    def update_perf_overlay(self):
+        """Shows recent AI latency percentiles and throughput, or hides the overlay."""
+        if self.show_perf_overlay and self.controller.game and self.controller.game.mode == 'AI':
+            self.perf_label.configure(text=self.controller.game.performance_summary())
+            self.perf_label.place(relx=0.02, rely=0.98, anchor="sw") # Bottom-left corner
+        else:
+            self.perf_label.place_forget()
+
+    def toggle_perf_overlay(self, event=None):
+        """Key handler (F3): shows or hides the performance overlay."""
+        self.show_perf_overlay = not self.show_perf_overlay
+        self.update_perf_overlay()
 
-    def update_buttons(self):
-        """Enables/disables the division buttons based on number divisibility and whose turn it is."""
-        state = self.controller.game.get_game_state()
+    def update_buttons(self, game, state):
+        """Enables/disables the division buttons based on number divisibility and whose turn it is in `state`."""
         # Disable all if game is over or state not ready
         if not state or state.terminal():
             self.btn_divide2.configure(state="disabled")
@@ -195,7 +237,7 @@ class GameScreen(ctk.CTkFrame):
         current_number = state.n
         # Determine if the human player should be able to interact
         is_player_turn = True
-        if self.controller.game.mode == 'AI' and self.controller.game.turn == 2:
+        if game.mode == 'AI' and state.turn == 2:
             is_player_turn = False # Disable buttons during AI's turn
 
         # Enable/disable based on divisibility AND if it's the player's turn
@@ -204,19 +246,25 @@ class GameScreen(ctk.CTkFrame):
 
     def end_game(self):
         """Cleans up pending actions and transitions to the result screen."""
-        # Cancel any pending AI move calculation
-        if self._after_id:
-            self.after_cancel(self._after_id)
-            self._after_id = None
+        self._game_over = False
+        self._ai_thinking = False
+        # A search still running in the background can no longer change this game
+        self.controller.game.close()
 
         self.last_move_label.configure(text="Last move: -") # Reset for potential next game
         self.controller.record_and_show_result() # Tell controller to show results
 
     def on_show(self):
         """Called when the GameScreen becomes visible. Sets up initial display and AI turn if needed."""
+        self._ai_thinking = False
+        self._game_over = False
+        # The overlay can also be switched on from the game settings
+        if self.controller.game.settings.get('perf_overlay'):
+            self.show_perf_overlay = True
 
-        self.update_display() # Ensure UI is current
-        self.update_buttons() # Set initial button states
+        game = self.controller.game
+        self.update_display(game, game.current_state) # Ensure UI is current
+        self.update_buttons(game, game.current_state) # Set initial button states
 
         # --- Trigger AI's first move if AI starts ---
         if self.controller.game.mode == 'AI' and \
@@ -225,12 +273,14 @@ class GameScreen(ctk.CTkFrame):
              self.computer_turn()
         elif self.controller.game.current_state and self.controller.game.current_state.terminal():
              # Ensure buttons are disabled if the game loaded is already finished
-             self.update_buttons()
+             self.update_buttons(game, game.current_state)
 
     def start_shaking_number(self):
         """Initiates the number label shaking animation."""
         self.shake_count = 0 # Reset shake counter
-        self.shake_number() # Start the animation loop
+        if not self.shaking: # Otherwise the running loop just starts over
+            self.shaking = True
+            self.shake_number() # Start the animation loop
 
     def shake_number(self):
         """Performs one step of the shaking animation and schedules the next."""
@@ -245,4 +295,7 @@ class GameScreen(ctk.CTkFrame):
             self.after(self.shake_delay, self.shake_number)
         else:
             # Reset position to center after the animation completes
-            self.current_number_label.place(relx=0.5, rely=0.4, anchor="center", x=0, y=0)
\ No newline at end of file
+            self.current_number_label.place(relx=0.5, rely=0.4, anchor="center", x=0, y=0)
+            self.shaking = False
+            if self._game_over:
+                self.end_game() # The final move has been seen: show the results
\ No newline at end of file
@@ -1,6 +1,17 @@
 import customtkinter as ctk
 import score_manager # To load high score data
 
+VISIBLE_ROWS = 15 # Score rows rendered at once; other rows are fetched page by page
+
+# Sort choices shown to the user -> (score_manager sort key, newest/largest first?)
+SORT_OPTIONS = {
+    "Newest": ('newest', True),
+    "AI Time": ('ai_time', False),
+    "Nodes": ('nodes', False),
+    "Initial N": ('initial_number', True),
+}
+
+
 class HighScoreScreen(ctk.CTkFrame):
     """UI Frame for displaying high scores recorded from games against the AI."""
 
@@ -10,12 +21,19 @@ class HighScoreScreen(ctk.CTkFrame):
         self.controller = controller # Reference to the main app controller
         self.configure(fg_color="#150B3B") # Background color
 
+        # --- Paging State ---
+        self.algorithm = 'alphabeta'   # Algorithm whose scores are shown
+        self.sort_label = "Newest"     # Current SORT_OPTIONS entry
+        self.page_cursors = [None]     # Cursor at the start of each page visited so far
+        self.has_next_page = False
+
         # Configure grid layout for responsive design
         self.grid_columnconfigure(0, weight=1) # Center content horizontally
         self.grid_rowconfigure(0, weight=0) # Title row
         self.grid_rowconfigure(1, weight=0) # Button row
-        self.grid_rowconfigure(2, weight=1) # Score display textbox (expandable)
-        self.grid_rowconfigure(3, weight=0) # Back button row
+        self.grid_rowconfigure(2, weight=0) # Sort/paging controls row
+        self.grid_rowconfigure(3, weight=1) # Score table (expandable)
+        self.grid_rowconfigure(4, weight=0) # Back button row
 
         # --- UI Elements ---
         self.title_label = ctk.CTkLabel(self, text="High Scores (vs AI)", font=("Jura Bold", 28), text_color="white")
@@ -28,7 +46,7 @@ class HighScoreScreen(ctk.CTkFrame):
         # Button to show Alpha-Beta scores
         self.btn_show_alphabeta = ctk.CTkButton(
             self.algo_button_frame, text="Alpha-Beta Scores",
-            command=lambda: self.load_and_display_scores('alphabeta'),
+            command=lambda: self.select_algorithm('alphabeta'),
             font=("Jura", 16), fg_color="#3E12E7"
         )
         self.btn_show_alphabeta.pack(side="left", padx=10)
@@ -36,19 +54,60 @@ class HighScoreScreen(ctk.CTkFrame):
         # Button to show Minimax scores
         self.btn_show_minimax = ctk.CTkButton(
             self.algo_button_frame, text="Minimax Scores",
-            command=lambda: self.load_and_display_scores('minimax'),
+            command=lambda: self.select_algorithm('minimax'),
             font=("Jura", 16), fg_color="#E77C12"
         )
         self.btn_show_minimax.pack(side="left", padx=10)
 
-        # Textbox for displaying the formatted scores
-        self.score_display = ctk.CTkTextbox(
-            self, font=("Consolas", 12), # Monospaced font for better alignment
-            wrap="none", fg_color="#2A1B5C", text_color="white",
-            border_width=1, border_color="#3E12E7"
+        # Button to show Auto mode scores
+        self.btn_show_auto = ctk.CTkButton(
+            self.algo_button_frame, text="Auto Scores",
+            command=lambda: self.select_algorithm('auto'),
+            font=("Jura", 16), fg_color="#0B8A00"
+        )
+        self.btn_show_auto.pack(side="left", padx=10)
+
+        # Button to show Expectimax scores
+        self.btn_show_expectimax = ctk.CTkButton(
+            self.algo_button_frame, text="Expectimax Scores",
+            command=lambda: self.select_algorithm('expectimax'),
+            font=("Jura", 16), fg_color="#8A0B6E"
         )
-        self.score_display.grid(row=2, column=0, sticky="nsew", padx=20, pady=(5, 10))
-        self.score_display.configure(state="disabled") # Make it read-only
+        self.btn_show_expectimax.pack(side="left", padx=10)
+
+        # --- Sort and Paging Controls ---
+        self.controls_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.controls_frame.grid(row=2, column=0, pady=5)
+        self.sort_selector = ctk.CTkSegmentedButton(
+            self.controls_frame, values=list(SORT_OPTIONS), command=self.select_sort, font=("Jura", 14)
+        )
+        self.sort_selector.set(self.sort_label)
+        self.sort_selector.pack(side="left", padx=10)
+        self.btn_prev_page = ctk.CTkButton(self.controls_frame, text="< Prev", width=80,
+                                           command=self.show_previous_page, font=("Jura", 14), fg_color="#3E12E7")
+        self.btn_prev_page.pack(side="left", padx=5)
+        self.page_label = ctk.CTkLabel(self.controls_frame, text="Page 1", font=("Jura", 14), text_color="white")
+        self.page_label.pack(side="left", padx=5)
+        self.btn_next_page = ctk.CTkButton(self.controls_frame, text="Next >", width=80,
+                                           command=self.show_next_page, font=("Jura", 14), fg_color="#3E12E7")
+        self.btn_next_page.pack(side="left", padx=5)
+
+        # --- Score Table: a fixed set of row labels reused for every page ---
+        self.table_frame = ctk.CTkFrame(self, fg_color="#2A1B5C", border_width=1, border_color="#3E12E7")
+        self.table_frame.grid(row=3, column=0, sticky="nsew", padx=20, pady=(5, 10))
+        self.header_label = ctk.CTkLabel(self.table_frame, text=self.format_header(), font=("Consolas", 12),
+                                         text_color="white", anchor="w", justify="left")
+        self.header_label.pack(fill="x", padx=10, pady=(5, 0))
+        self.row_labels = []
+        for _ in range(VISIBLE_ROWS):
+            label = ctk.CTkLabel(self.table_frame, text="", font=("Consolas", 12), # Monospaced for alignment
+                                 text_color="white", anchor="w", justify="left", height=18)
+            label.pack(fill="x", padx=10)
+            self.row_labels.append(label)
+        # Mouse wheel pages through the history
+        self.table_frame.bind("<MouseWheel>", self.on_mouse_wheel)
+        for label in self.row_labels:
+            label.bind("<MouseWheel>", self.on_mouse_wheel)
 
         # Button to navigate back to the main menu
         self.btn_back = ctk.CTkButton(
@@ -56,46 +115,89 @@ class HighScoreScreen(ctk.CTkFrame):
             command=lambda: self.controller.show_frame("main_menu"),
             font=("Jura", 18), width=200, height=40, fg_color="#5C1500"
         )
-        self.btn_back.grid(row=3, column=0, pady=(10, 20))
-
-    def format_scores(self, score_list):
-        """Formats a list of score dictionaries into a neatly aligned string."""
-        if not score_list:
-            return "No scores recorded yet for this algorithm."
-
-        # Define headers and separator for the table-like format
-        header = (f"{'#':<3}{'Winner':<10}{'Start Player':<14}{'Initial N':<12}"
-                  f"{'Moves':<7}{'AI Time (s)':<38}{'Nodes Explored':<17}\n")
-        separator = "-" * 101 + "\n" # Adjust length based on header
-        lines = [header, separator]
-
-        # Format each score entry, showing newest first
-        for i, score in enumerate(reversed(score_list), 1): # Use reversed for newest first
-             lines.append(
-                 f"{i:<3}" # Index
-                 f"{score.get('winner', 'N/A'):<10}"
-                 f"{score.get('starting_player', 'N/A').capitalize():<14}"
-                 f"{score.get('initial_number', 0):<12,}" # Number with comma separator
-                 f"{score.get('total_moves', 0):<7}"
-                 f"{score.get('total_ai_time', 0.0):<38,.30f}" # AI time with high precision
-                 f"{score.get('total_nodes_explored', 0):<17,}" # Nodes with comma separator
-                 "\n"
-             )
-        return "".join(lines) # Combine all lines into a single string
-
-    def load_and_display_scores(self, algorithm):
-        """Loads scores for the specified algorithm and updates the display."""
-        all_scores = score_manager.load_scores() # Get all scores from file
-        scores_to_display = all_scores.get(algorithm, []) # Get list for the chosen algorithm
-        formatted_text = self.format_scores(scores_to_display) # Format the list
-
-        # Update the textbox content
-        self.score_display.configure(state="normal") # Enable writing temporarily
-        self.score_display.delete("1.0", "end")      # Clear existing content
-        self.score_display.insert("1.0", formatted_text) # Insert new formatted text
-        self.score_display.configure(state="disabled") # Make read-only again
+        self.btn_back.grid(row=4, column=0, pady=(10, 20))
+
+    def format_header(self):
+        """Column headers and separator of the score table."""
+        header = (f"{'#':<5}{'Winner':<10}{'Start Player':<14}{'Initial N':<12}"
+                  f"{'Moves':<7}{'AI Time (s)':<16}{'Nodes Explored':<17}{'Cache Hits':<10}")
+        return header + "\n" + "-" * len(header)
+
+    def format_row(self, index, score):
+        """Formats one score dictionary as an aligned table row."""
+        cache_hit_rate = score.get('cache_hit_rate')
+        return (f"{index:<5}"
+                f"{score.get('winner') or 'N/A':<10}"
+                f"{(score.get('starting_player') or 'N/A').capitalize():<14}"
+                f"{score.get('initial_number') or 0:<12,}" # Number with comma separator
+                f"{score.get('total_moves') or 0:<7}"
+                f"{score.get('total_ai_time') or 0.0:<16.6f}"
+                f"{score.get('total_nodes_explored') or 0:<17,}" # Nodes with comma separator
+                f"{'-' if cache_hit_rate is None else f'{cache_hit_rate:.0%}':<10}")
+
+    def show_page(self):
+        """Fetches the current page from score_manager and renders it into the row labels."""
+        sort_key, descending = SORT_OPTIONS[self.sort_label]
+        # One extra row tells whether a next page exists
+        rows, _ = score_manager.fetch_page(self.algorithm, sort_key, descending,
+                                           self.page_cursors[-1], VISIBLE_ROWS + 1)
+        self.has_next_page = len(rows) > VISIBLE_ROWS
+        rows = rows[:VISIBLE_ROWS]
+        first_index = (len(self.page_cursors) - 1) * VISIBLE_ROWS + 1
+
+        for i, label in enumerate(self.row_labels):
+            if i < len(rows):
+                label.configure(text=self.format_row(first_index + i, rows[i]))
+            elif i == 0:
+                label.configure(text="No scores recorded yet for this algorithm.")
+            else:
+                label.configure(text="")
+
+        self.page_label.configure(text=f"Page {len(self.page_cursors)}")
+        self.btn_prev_page.configure(state="normal" if len(self.page_cursors) > 1 else "disabled")
+        self.btn_next_page.configure(state="normal" if self.has_next_page else "disabled")
+        # Remember where the next page starts
+        self._next_cursor = self.cursor_after(rows, sort_key)
+
+    def cursor_after(self, rows, sort_key):
+        """Keyset cursor positioned after the last row of a page."""
+        if not rows:
+            return None
+        column = score_manager.SORT_COLUMNS[sort_key]
+        return (rows[-1][column], rows[-1]['id'])
+
+    def show_next_page(self):
+        if self.has_next_page:
+            self.page_cursors.append(self._next_cursor)
+            self.show_page()
+
+    def show_previous_page(self):
+        if len(self.page_cursors) > 1:
+            self.page_cursors.pop()
+            self.show_page()
+
+    def on_mouse_wheel(self, event):
+        """Scrolling down shows the next page, scrolling up the previous one."""
+        if event.delta < 0:
+            self.show_next_page()
+        elif event.delta > 0:
+            self.show_previous_page()
+
+    def reset_paging(self):
+        self.page_cursors = [None]
+        self.show_page()
+
+    def select_algorithm(self, algorithm):
+        """Shows the first page of scores for the given algorithm."""
+        self.algorithm = algorithm
+        self.reset_paging()
+
+    def select_sort(self, sort_label):
+        """Re-sorts the table (in the database) and returns to the first page."""
+        self.sort_label = sort_label
+        self.reset_paging()
 
     def on_show(self):
         """Called when this frame becomes visible. Loads default scores."""
         # Default to showing Alpha-Beta scores when the screen is first opened
-        self.load_and_display_scores('alphabeta')
\ No newline at end of file
+        self.select_algorithm('alphabeta')
@@ -1,5 +1,7 @@
+import os
 import random
 import customtkinter as ctk
+from opponent_model import OPPONENT_MODEL_FILE
 
 class MainMenu(ctk.CTkFrame):
     """UI Frame for the main menu, allowing game configuration and starting."""
@@ -12,7 +14,7 @@ class MainMenu(ctk.CTkFrame):
 
         # --- State Variables for Game Settings ---
         self.mode_var = ctk.StringVar(value="AI")          # Game mode: 'AI' or '1v1'
-        self.algo_var = ctk.StringVar(value="alphabeta")   # AI algorithm: 'minimax' or 'alphabeta'
+        self.algo_var = ctk.StringVar(value="alphabeta")   # AI algorithm: 'minimax', 'alphabeta', 'auto' or 'expectimax'
         self.starting_player_var = ctk.StringVar(value="ai") # Who starts: 'player', 'ai', 'player1', 'player2'
         self.numbers = [] # List to hold generated starting numbers
         self.selected_number_var = ctk.StringVar() # Holds the chosen starting number as a string
@@ -54,10 +56,19 @@ class MainMenu(ctk.CTkFrame):
         # --- AI Algorithm Selection (Radio Buttons - conditionally visible) ---
         self.algo_label = ctk.CTkLabel(self, text="AI Algorithm:", font=("Jura", 20), text_color="white")
         self.algo_label.grid(row=3, column=0, padx=(20, 5), pady=5, sticky="w")
-        self.radio_minimax = ctk.CTkRadioButton(self, text="Minimax", variable=self.algo_var, value="minimax", font=("Jura", 18), fg_color="#3E12E7", text_color="white")
-        self.radio_minimax.grid(row=3, column=1, padx=5, pady=5, sticky="w")
-        self.radio_alphabeta = ctk.CTkRadioButton(self, text="Alpha-Beta", variable=self.algo_var, value="alphabeta", font=("Jura", 18), fg_color="#3E12E7", text_color="white")
-        self.radio_alphabeta.grid(row=3, column=2, padx=(5, 20), pady=5, sticky="w")
+        # Radio buttons share a frame so more algorithms fit in the two option columns
+        self.algo_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.algo_frame.grid(row=3, column=1, columnspan=2, padx=(5, 20), pady=5, sticky="w")
+        self.radio_minimax = ctk.CTkRadioButton(self.algo_frame, text="Minimax", variable=self.algo_var, value="minimax", font=("Jura", 18), fg_color="#3E12E7", text_color="white")
+        self.radio_minimax.pack(side="left", padx=(0, 10))
+        self.radio_alphabeta = ctk.CTkRadioButton(self.algo_frame, text="Alpha-Beta", variable=self.algo_var, value="alphabeta", font=("Jura", 18), fg_color="#3E12E7", text_color="white")
+        self.radio_alphabeta.pack(side="left", padx=10)
+        # Auto picks the cheapest engine that fits the time budget for the current number
+        self.radio_auto = ctk.CTkRadioButton(self.algo_frame, text="Auto", variable=self.algo_var, value="auto", font=("Jura", 18), fg_color="#3E12E7", text_color="white")
+        self.radio_auto.pack(side="left", padx=10)
+        # Expectimax plays for the best expected score against human-like (non-optimal) moves
+        self.radio_expectimax = ctk.CTkRadioButton(self.algo_frame, text="Expectimax", variable=self.algo_var, value="expectimax", font=("Jura", 18), fg_color="#3E12E7", text_color="white")
+        self.radio_expectimax.pack(side="left", padx=10)
 
         # --- Generate Starting Numbers Button ---
         self.generate_btn = ctk.CTkButton(self, text="Generate Starting Numbers 🎲", command=self.generate_numbers, font=("Jura", 20), width=400, height=40, fg_color="#3E12E7", text_color="white")
@@ -116,7 +127,7 @@ class MainMenu(ctk.CTkFrame):
         """Shows or hides the AI algorithm selection widgets based on game mode."""
         is_ai_mode = (self.mode_var.get() == "AI")
         # Use grid() to show and grid_remove() to hide, preserving grid configuration
-        widgets = [self.algo_label, self.radio_minimax, self.radio_alphabeta]
+        widgets = [self.algo_label, self.algo_frame]
         for widget in widgets:
             if is_ai_mode:
                 widget.grid()
@@ -180,7 +191,8 @@ class MainMenu(ctk.CTkFrame):
         settings = {
             'mode': self.mode_var.get(),
             'algorithm': self.algo_var.get(),
-            'starting_player': self.starting_player_var.get()
+            'starting_player': self.starting_player_var.get(),
+            'opponent_model': self.opponent_model(), # Expectimax: how the human is expected to move
         }
         # Algorithm choice is irrelevant in 1v1 mode
         if settings['mode'] == '1v1':
@@ -189,8 +201,14 @@ class MainMenu(ctk.CTkFrame):
         # Pass settings and number to the main app controller to initiate the game
         self.controller.start_new_game(settings, starting_number)
 
+    def opponent_model(self):
+        """'fitted' once `python opponent_model.py` has fitted human move frequencies, else 'uniform'."""
+        return 'fitted' if os.path.exists(OPPONENT_MODEL_FILE) else 'uniform'
+
     def on_show(self):
         """Called when the MainMenu frame becomes visible."""
+        # Show which opponent model Expectimax will play against (records may have been fitted since)
+        self.radio_expectimax.configure(text=f"Expectimax ({self.opponent_model()})")
         # Reset state for a fresh menu view
         self.selected_number_var.set("") # Clear number selection
         self.start_btn.configure(state="disabled") # Disable start button
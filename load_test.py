@@ -0,0 +1,83 @@
+import json
+import time
+import random
+import asyncio
+import argparse
+from game_server import DEFAULT_HOST, DEFAULT_PORT
+from game_logic import percentile
+
+
+def random_starting_number(rng):
+    """Same draw as MainMenu.generate_valid_numbers: a multiple of 6 in [10000, 20000]."""
+    while True:
+        num = rng.randint(10000, 20000)
+        if num % 2 == 0 and num % 3 == 0:
+            return num
+
+
+async def request(reader, writer, payload, latencies):
+    """Sends one JSON line and waits for the reply, recording the round-trip time."""
+    start_time = time.perf_counter()
+    writer.write(json.dumps(payload).encode() + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    latencies.append(time.perf_counter() - start_time)
+    if not response.get('ok'):
+        raise RuntimeError(response.get('error'))
+    return response
+
+
+async def run_session(host, port, unix_path, games, algorithm, rng, ai_latencies, move_latencies):
+    """Plays `games` full games against the server AI, choosing human moves at random."""
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games):
+            response = await request(reader, writer, {
+                'op': 'new', 'algorithm': algorithm, 'starting_player': rng.choice(['player', 'ai']),
+                'number': random_starting_number(rng),
+            }, move_latencies)
+            while not response['state']['terminal']:
+                state = response['state']
+                if state['turn'] == 2: # The AI is always player 2 in AI mode
+                    response = await request(reader, writer, {'op': 'ai'}, ai_latencies)
+                else:
+                    moves = [d for d in (2, 3) if state['n'] % d == 0]
+                    response = await request(reader, writer, {'op': 'move', 'divisor': rng.choice(moves)}, move_latencies)
+        await request(reader, writer, {'op': 'quit'}, move_latencies)
+    finally:
+        writer.close()
+
+
+async def load_test(host, port, unix_path, sessions, games, algorithm, seed):
+    rng = random.Random(seed)
+    ai_latencies, move_latencies = [], []
+    start_time = time.perf_counter()
+    await asyncio.gather(*(
+        run_session(host, port, unix_path, games, algorithm, random.Random(rng.random()), ai_latencies, move_latencies)
+        for _ in range(sessions)
+    ))
+    elapsed = time.perf_counter() - start_time
+
+    print(f"{sessions} sessions x {games} games in {elapsed:.2f}s "
+          f"({(len(ai_latencies) + len(move_latencies)) / elapsed:,.0f} requests/s)")
+    for label, latencies in (("AI move", ai_latencies), ("Human move", move_latencies)):
+        print(f"{label:<11} n={len(latencies):<7,} "
+              f"p50={percentile(latencies, 50) * 1000:.2f}ms p90={percentile(latencies, 90) * 1000:.2f}ms "
+              f"p99={percentile(latencies, 99) * 1000:.2f}ms max={max(latencies, default=0.0) * 1000:.2f}ms")
+
+
+# --- Load Test Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure game server latency with N concurrent sessions.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Connect to this Unix socket path instead of TCP")
+    parser.add_argument("--sessions", type=int, default=50, help="Concurrent sessions")
+    parser.add_argument("--games", type=int, default=5, help="Games played per session")
+    parser.add_argument("--algorithm", default="alphabeta")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(load_test(args.host, args.port, args.unix, args.sessions, args.games, args.algorithm, args.seed))
@@ -1,3 +1,5 @@
+import os
+import time
 import customtkinter as ctk
 import re # For converting class names to keys
 from gui.main_menu import MainMenu
@@ -6,6 +8,8 @@ from gui.result_screen import ResultScreen
 from gui.high_score_screen import HighScoreScreen
 from game_logic import Game # Core game logic class
 import score_manager # For handling high scores
+from solution_cache import SolutionCache # Solved positions shared between games and app launches
+from events import EventBus, TkEventBridge # Game events delivered on the Tk loop
 
 class GameApp(ctk.CTk):
     """Main application class that manages UI frames and the game instance."""
@@ -19,6 +23,9 @@ class GameApp(ctk.CTk):
 
         self.current_frame = None # Holds the currently displayed frame
         self.game = None          # Holds the active Game logic instance
+        self.solution_cache = SolutionCache() # Loaded from disk on the first AI move
+        self.events = EventBus() # Frames subscribe to game events instead of polling the game
+        TkEventBridge(self, self.events)
 
         # Create and store all UI frame instances in a dictionary
         self.frames = {}
@@ -51,13 +58,15 @@ class GameApp(ctk.CTk):
 
     def start_new_game(self, settings, starting_number):
         """Creates a new Game instance and switches to the game screen."""
-        self.game = Game(settings) # Initialize game logic
+        if self.game:
+            self.game.close() # The previous game may still have an AI search running
+        self.game = Game(settings, self.solution_cache, self.events) # Initialize game logic
         self.game.select_number(starting_number) # Set up the initial state
 
         # Prepare the game screen UI before showing it
         game_screen_frame = self.frames.get("game_screen")
         if game_screen_frame:
-             game_screen_frame.update_display() # Ensure UI reflects initial state
+             game_screen_frame.update_display(self.game, self.game.current_state) # Ensure UI reflects initial state
 
         self.show_frame("game_screen")
         # The game_screen's on_show method will handle triggering the AI's first move if needed.
@@ -84,10 +93,15 @@ class GameApp(ctk.CTk):
                 'initial_number': self.game.initial_number,
                 'total_moves': self.game.total_moves,
                 'total_ai_time': self.game.total_ai_time, # Include performance stats
-                'total_nodes_explored': self.game.total_nodes_explored
+                'total_nodes_explored': self.game.total_nodes_explored,
+                'cache_hit_rate': self.game.cache_hit_rate()
             }
             score_manager.add_score(game_data) # Add to high scores
 
+        # Keep the full move sequence of finished games for replay and AI regression runs
+        if winner != "Game Incomplete":
+            self.game.save_record()
+
         # Update the result screen UI with outcome and scores
         result_screen_frame = self.frames.get("result_screen")
         if result_screen_frame:
@@ -97,9 +111,23 @@ class GameApp(ctk.CTk):
 
     def on_closing(self):
         """Called when the user closes the application window."""
+        if self.game:
+            self.game.close() # A search still running in the background must not apply its move
+        self.solution_cache.flush() # Keep solved positions for the next launch (the cache is thread-safe)
         self.destroy() # Cleanly close the Tkinter application
 
+def report_startup(app, ready_file):
+    """Launch benchmark hook: writes the wall-clock time the first frame is drawn, then quits."""
+    app.update_idletasks() # Make sure the main menu has actually been laid out and drawn
+    with open(ready_file, 'w') as f:
+        f.write(repr(time.time()))
+    app.destroy()
+
 # --- Application Entry Point ---
 if __name__ == "__main__":
     app = GameApp() # Create the application instance
+    # Set by bench_startup.py to time how long the app takes to show its first window
+    startup_bench_file = os.environ.get("NDG_STARTUP_BENCH")
+    if startup_bench_file:
+        app.after(0, report_startup, app, startup_bench_file)
     app.mainloop() # Start the Tkinter event loop
\ No newline at end of file
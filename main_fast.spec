@@ -0,0 +1,71 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Startup-optimized build: one-dir layout (nothing is unpacked on launch), no UPX (nothing is
+# decompressed on launch), bytecode compiled with optimize=2 and unused modules/data left out.
+# Build with `pyinstaller main_fast.spec`; compare launch times with `python bench_startup.py`.
+import os
+
+# Optional imports the game never needs (PIL is only used by customtkinter's CTkImage), the
+# stdlib test/doc tooling, and the tools that live next to the game
+EXCLUDED_MODULES = [
+    'PIL', 'numpy', 'unittest', 'doctest', 'pydoc', 'test', 'tkinter.test', 'lib2to3', 'xmlrpc',
+    'batch_eval', 'tune_heuristic', 'solve_range', 'game_server', 'load_test', 'bench_expectimax',
+    'bench_startup',
+]
+# Tcl/Tk and customtkinter data the game never uses: time zones, Tk demos and sample images,
+# and the customtkinter themes other than the default blue one
+EXCLUDED_DATA_DIRS = {'tzdata', 'demos', 'images'}
+EXCLUDED_THEMES = {'dark-blue.json', 'green.json'}
+
+
+def keep_data(dest):
+    parts = dest.replace('\\', '/').split('/')
+    if parts[0] in ('_tcl_data', '_tk_data', 'tcl', 'tk') and EXCLUDED_DATA_DIRS.intersection(parts[1:]):
+        return False
+    return not (parts[0] == 'customtkinter' and 'themes' in parts and parts[-1] in EXCLUDED_THEMES)
+
+
+# Precomputed AI table (python solve_range.py), bundled only when it has been generated
+datas = [('solved_table.bin', '.')] if os.path.exists('solved_table.bin') else []
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=datas,
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=EXCLUDED_MODULES,
+    noarchive=False,
+    optimize=2,
+)
+a.datas = [entry for entry in a.datas if keep_data(entry[0])]
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='main_fast',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='main_fast',
+)
@@ -0,0 +1,122 @@
+import os
+import glob
+import json
+import argparse
+from game_record import RecordReader, RECORD_DIR, RECORD_EXTENSION
+from state_key import is_terminal_number
+
+OPPONENT_MODEL_FILE = "opponent_model.json" # Move frequencies fitted from recorded human games
+MODEL_VERSION = 1
+PRIOR_MOVES = 2 # Laplace smoothing: every situation starts as one pick of each move
+
+
+def situation(n):
+    """
+    What a human sees when both moves are legal: (dividing by 2 scores a point,
+    dividing by 2 ends the game, dividing by 3 ends the game). Dividing by 3 always scores
+    here since n is even. Only depends on n, so the model is constant per canonical state.
+    """
+    return (n // 2 % 2 == 0, is_terminal_number(n // 2), is_terminal_number(n // 3))
+
+
+def _bucket_name(bucket):
+    return ",".join(str(int(flag)) for flag in bucket)
+
+
+class OpponentModel:
+    """
+    Probability that the opponent divides by 2 or by 3 in a position, used by ai.expectimax.
+    With no counts every choice is a coin flip (the uniform model).
+    """
+
+    def __init__(self, counts=None, name='uniform'):
+        """counts: situation tuple -> [times divided by 3, times both moves were available]."""
+        self.counts = counts or {}
+        self.name = name
+
+    def move_probabilities(self, state):
+        """Returns (p_divide_by_2, p_divide_by_3); forced moves get probability 1."""
+        if state.left is None:
+            return 0.0, 1.0
+        if state.right is None:
+            return 1.0, 0.0
+        threes, total = self.counts.get(situation(state.n), (0, 0))
+        p_three = (threes + PRIOR_MOVES / 2) / (total + PRIOR_MOVES)
+        return 1.0 - p_three, p_three
+
+    def to_dict(self):
+        return {'version': MODEL_VERSION, 'name': self.name,
+                'counts': {_bucket_name(bucket): list(count) for bucket, count in self.counts.items()}}
+
+
+def fit_from_records(paths):
+    """
+    Fits move frequencies to the human moves in game records. Only choices between two legal
+    moves are counted; forced moves say nothing about preferences.
+    Returns (OpponentModel, number of human choices counted).
+    """
+    counts = {}
+    choices = 0
+    for path in paths:
+        try:
+            reader = RecordReader(path)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        with reader:
+            n = reader.initial_number
+            for ply in reader:
+                if not ply.is_ai and n % 6 == 0 and n > 3:
+                    count = counts.setdefault(situation(n), [0, 0])
+                    count[0] += ply.divisor == 3
+                    count[1] += 1
+                    choices += 1
+                n = ply.n
+    return OpponentModel(counts, name='fitted'), choices
+
+
+def save_model(model, path=OPPONENT_MODEL_FILE):
+    try:
+        with open(path, 'w') as f:
+            json.dump(model.to_dict(), f, indent=2)
+    except IOError as e:
+        print(f"Error saving opponent model to {path}: {e}")
+
+
+def load_model(kind='uniform', path=OPPONENT_MODEL_FILE):
+    """
+    Returns the opponent model for a settings value: 'uniform', or 'fitted' (read from `path`).
+    Falls back to the uniform model when no fitted model is available (e.g. no records yet).
+    """
+    if kind != 'fitted':
+        return OpponentModel()
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != MODEL_VERSION:
+            raise ValueError(f"expected version {MODEL_VERSION}")
+        counts = {tuple(flag == "1" for flag in name.split(",")): tuple(count)
+                  for name, count in data['counts'].items()}
+        return OpponentModel(counts, name='fitted')
+    except (IOError, ValueError, KeyError, TypeError, AttributeError) as e:
+        if os.path.exists(path):
+            print(f"Error loading opponent model from {path}: {e}. Using the uniform model.")
+        else:
+            print(f"No fitted opponent model at {path} (run opponent_model.py). Using the uniform model.")
+        return OpponentModel()
+
+
+# --- Model Fitting Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the opponent model to human moves in game records.")
+    parser.add_argument("paths", nargs="*", help=f"Record files (default: all in {RECORD_DIR}/)")
+    parser.add_argument("--output", default=OPPONENT_MODEL_FILE)
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(RECORD_DIR, "*" + RECORD_EXTENSION)))
+    model, choices = fit_from_records(paths)
+    print(f"Fitted {len(model.counts)} situations from {choices:,} human choices in {len(paths)} records")
+    for bucket, (threes, total) in sorted(model.counts.items()):
+        print(f"  {_bucket_name(bucket)}: divided by 3 in {threes}/{total}")
+    save_model(model, args.output)
+    print(f"Saved to {args.output}")
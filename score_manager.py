@@ -1,46 +1,156 @@
 import json
 import os
+import sqlite3
 
-SCORE_FILE = "high_scores.json" # Name of the file to store scores
-MAX_SCORES_PER_ALGO = 10       # Maximum number of scores to keep for each algorithm
+SCORE_DB = "high_scores.db"          # SQLite store holding the full game history
+SCORE_FILE = "high_scores.json"      # Legacy JSON scores, imported once into the database
+PAGE_SIZE = 20                       # Default number of rows fetched per page
+MAX_SCORES_PER_ALGO = 10_000         # Most recent games kept for each algorithm (older ones are deleted)
+
+# Sort keys offered to the UI -> indexed column. Ties are broken by id (insertion order).
+SORT_COLUMNS = {
+    'newest': 'id',
+    'ai_time': 'total_ai_time',
+    'nodes': 'total_nodes_explored',
+    'initial_number': 'initial_number',
+}
+# Columns of a score row, in the order they are stored
+SCORE_FIELDS = ('algorithm', 'winner', 'starting_player', 'initial_number', 'total_moves',
+                'total_ai_time', 'total_nodes_explored', 'cache_hit_rate')
+
+_connection = None # Opened lazily on first use
+
+
+def _get_connection():
+    """Opens the score database, creating the schema and importing legacy JSON scores on first run."""
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(SCORE_DB)
+        _connection.row_factory = sqlite3.Row
+        with _connection:
+            _connection.execute("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    id INTEGER PRIMARY KEY,
+                    algorithm TEXT NOT NULL,
+                    winner TEXT,
+                    starting_player TEXT,
+                    initial_number INTEGER NOT NULL DEFAULT 0,
+                    total_moves INTEGER,
+                    total_ai_time REAL NOT NULL DEFAULT 0,
+                    total_nodes_explored INTEGER NOT NULL DEFAULT 0,
+                    cache_hit_rate REAL
+                )""")
+            # One index per sort order, so every page is a bounded index range scan
+            for sort_key, column in SORT_COLUMNS.items():
+                _connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_scores_{sort_key} ON scores (algorithm, {column}, id)")
+            _connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        _fill_sort_columns(_connection)
+        _import_legacy_scores(_connection)
+    return _connection
+
+
+def _fill_sort_columns(conn):
+    """
+    Replaces NULLs in the sort columns of databases created before they were NOT NULL (only
+    once). The keyset comparison of fetch_page is never true for NULL, so those rows were skipped.
+    """
+    if conn.execute("SELECT 1 FROM meta WHERE name = 'sort_columns_filled'").fetchone():
+        return
+    with conn:
+        for column in SORT_COLUMNS.values():
+            conn.execute(f"UPDATE scores SET {column} = 0 WHERE {column} IS NULL")
+        conn.execute("INSERT INTO meta (name, value) VALUES ('sort_columns_filled', '1')")
+
+
+def _import_legacy_scores(conn):
+    """Copies scores from the old JSON file into the database (only once)."""
+    if conn.execute("SELECT 1 FROM meta WHERE name = 'legacy_imported'").fetchone():
+        return
+    legacy = {}
+    if os.path.exists(SCORE_FILE):
+        try:
+            with open(SCORE_FILE, 'r') as f:
+                legacy = json.load(f)
+        except (json.JSONDecodeError, IOError, TypeError) as e:
+            print(f"Error loading legacy scores from {SCORE_FILE}: {e}. Skipping import.")
+    with conn:
+        for algo, score_list in legacy.items():
+            for game_data in score_list:
+                _insert(conn, dict(game_data, algorithm=game_data.get('algorithm', algo)))
+        conn.execute("INSERT INTO meta (name, value) VALUES ('legacy_imported', '1')")
+
+
+def _insert(conn, game_data):
+    # Sort columns are NOT NULL: a missing statistic (e.g. no AI in 1v1 games) is stored as 0
+    sort_columns = SORT_COLUMNS.values()
+    conn.execute(
+        f"INSERT INTO scores ({', '.join(SCORE_FIELDS)}) VALUES ({', '.join('?' * len(SCORE_FIELDS))})",
+        [game_data.get(field) or 0 if field in sort_columns else game_data.get(field) for field in SCORE_FIELDS],
+    )
+    _trim(conn, game_data.get('algorithm'))
+
+
+def _trim(conn, algorithm):
+    """Deletes the games of `algorithm` older than its MAX_SCORES_PER_ALGO most recent ones."""
+    conn.execute(
+        "DELETE FROM scores WHERE algorithm = ? AND id <= "
+        "(SELECT id FROM scores WHERE algorithm = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+        (algorithm, algorithm, MAX_SCORES_PER_ALGO),
+    )
 
-def load_scores():
-    """Loads scores from the JSON file. Returns default structure if file is missing or invalid."""
-    # Default structure if no file exists or loading fails
-    default_scores = {"minimax": [], "alphabeta": []}
-    if not os.path.exists(SCORE_FILE):
-        return default_scores
-    try:
-        with open(SCORE_FILE, 'r') as f:
-            scores = json.load(f)
-            # Ensure the basic keys exist even if the file was partially corrupted
-            if "minimax" not in scores: scores["minimax"] = []
-            if "alphabeta" not in scores: scores["alphabeta"] = []
-            return scores
-    except (json.JSONDecodeError, IOError, TypeError) as e:
-        # Handle potential errors during file reading or JSON parsing
-        print(f"Error loading scores from {SCORE_FILE}: {e}. Returning empty scores.")
-        return default_scores
-
-def save_scores(scores):
-    """Saves the scores dictionary to the JSON file."""
-    try:
-        with open(SCORE_FILE, 'w') as f:
-            # Save with indentation for readability
-            json.dump(scores, f, indent=4)
-    except IOError as e:
-        print(f"Error saving scores to {SCORE_FILE}: {e}")
 
 def add_score(game_data):
-    """Adds a new game result to the scores list for the relevant algorithm."""
+    """Adds a new game result to the score history, keeping the latest MAX_SCORES_PER_ALGO per algorithm."""
+    try:
+        conn = _get_connection()
+        with conn:
+            _insert(conn, game_data)
+    except sqlite3.Error as e:
+        print(f"Error saving score to {SCORE_DB}: {e}")
 
-    algo = game_data['algorithm']
-    scores = load_scores() # Load the current scores
 
-    # Append the new game result data
-    scores[algo].append(game_data)
+def fetch_page(algorithm, sort='newest', descending=True, after=None, limit=PAGE_SIZE):
+    """
+    Returns one page of scores for `algorithm`, ordered by `sort` (a SORT_COLUMNS key).
+    Pagination is keyset-based: pass the cursor returned with the previous page as `after`.
+    The database does the sorting, and each page costs the same however long the history is.
+    Returns (rows, cursor) where rows are dicts and cursor is None when the page is empty.
+    """
+    column = SORT_COLUMNS[sort]
+    direction, comparison = ("DESC", "<") if descending else ("ASC", ">")
+    query = f"SELECT id, {', '.join(SCORE_FIELDS)} FROM scores WHERE algorithm = ?"
+    params = [algorithm]
+    if after is not None:
+        query += f" AND ({column}, id) {comparison} (?, ?)"
+        params.extend(after)
+    query += f" ORDER BY {column} {direction}, id {direction} LIMIT ?"
+    params.append(limit)
+    try:
+        rows = [dict(row) for row in _get_connection().execute(query, params)]
+    except sqlite3.Error as e:
+        print(f"Error reading scores from {SCORE_DB}: {e}")
+        return [], None
+    cursor = (rows[-1][column], rows[-1]['id']) if rows else None
+    return rows, cursor
+
+
+def iter_scores(algorithm, sort='newest', descending=True, page_size=PAGE_SIZE):
+    """Generator over all scores for `algorithm`, fetched page by page."""
+    cursor = None
+    while True:
+        rows, cursor = fetch_page(algorithm, sort, descending, cursor, page_size)
+        if not rows:
+            return
+        yield from rows
 
-    # Trim the list to keep only the latest N scores (FIFO if N exceeded)
-    scores[algo] = scores[algo][-MAX_SCORES_PER_ALGO:]
 
-    save_scores(scores) # Save the updated scores back to the file
\ No newline at end of file
+def load_scores():
+    """Loads the whole history grouped by algorithm (oldest first). Prefer fetch_page for display."""
+    scores = {"minimax": [], "alphabeta": []}
+    try:
+        for row in _get_connection().execute(f"SELECT {', '.join(SCORE_FIELDS)} FROM scores ORDER BY id"):
+            scores.setdefault(row['algorithm'], []).append(dict(row))
+    except sqlite3.Error as e:
+        print(f"Error reading scores from {SCORE_DB}: {e}")
+    return scores
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+CACHE_FILE = "solution_cache.json" # Persisted solved positions, shared by every game
+MAX_CACHE_ENTRIES = 200_000        # LRU bound on the number of cached positions
+CACHE_VERSION = 3                  # Bumped whenever the key or entry layout, or the stored moves, change
+
+
+def canonical_key(state, algorithm):
+    """Cache key of a solved position: the algorithm plus the state's canonical key (see state_key)."""
+    return key_for(state.key, algorithm)
+
+
+def key_for(state_key, algorithm):
+    """Cache key from a bare canonical state key (e.g. from a packed solved subtree)."""
+    return f"{algorithm}:{state_key:x}"
+
+
+class SolutionCache:
+    """
+    Bounded position -> (value, best move) cache with LRU eviction and optional JSON persistence.
+    Thread-safe: the GUI searches on a worker thread while the Tk thread may flush the cache.
+    """
+
+    def __init__(self, path=CACHE_FILE, max_entries=MAX_CACHE_ENTRIES):
+        """
+        path: JSON file the cache is loaded from and flushed to (None keeps it in memory only).
+        max_entries: Maximum number of positions kept; least recently used ones are evicted.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._loaded = path is None # Nothing to load for an in-memory cache
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        """Reads the cache file on first use so app startup does not pay for it."""
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION:
+                return # Stale layout: start cold rather than trust old keys
+            for key, value, move in data.get('entries', [])[-self.max_entries:]:
+                self._entries[key] = (value, move)
+        except (json.JSONDecodeError, IOError, TypeError, ValueError, AttributeError) as e:
+            print(f"Error loading solution cache from {self.path}: {e}. Starting with an empty cache.")
+            self._entries.clear()
+
+    def get(self, key):
+        """Returns (value, best_move) for a solved position, or None."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key) # Mark as recently used
+            self.hits += 1
+            return entry
+
+    def put(self, key, value, move):
+        """Stores a solved position, evicting the least recently used entry when full."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._entries[key] = (value, move)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def shrink(self, fraction=0.5):
+        """
+        Evicts least recently used entries down to `fraction` of the current size to free memory.
+        max_entries is left as is, so the cache may grow back once the pressure is gone.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            target = int(len(self._entries) * fraction)
+            while len(self._entries) > target:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def __len__(self):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return len(self._entries)
+
+    def flush(self):
+        """Writes the cache to its file if anything changed since it was loaded."""
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            # Oldest first, so a reload restores the same LRU order
+            entries = [[key, value, move] for key, (value, move) in self._entries.items()]
+            self._dirty = False
+        try:
+            with open(self.path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': entries}, f)
+        except IOError as e:
+            self._dirty = True # Try again on the next flush
+            print(f"Error saving solution cache to {self.path}: {e}")
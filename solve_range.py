@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import struct
+import argparse
+import multiprocessing
+from multiprocessing import shared_memory
+import state_key
+# The results layout is owned by the reader that ships with the app
+from ai_table import RESULTS_FILE, RESULTS_MAGIC, RESULTS_VERSION, HEADER_FORMAT, RECORD_FORMAT, RECORD_SIZE
+
+DEFAULT_TABLE_SLOTS = 1 << 22      # Entries in the shared sub-position table (16 bytes each)
+LOCAL_MEMO_LIMIT = 1_000_000       # Per-process memo is cleared beyond this many entries
+VALUE_OFFSET = 1 << 19             # Values are stored as value + VALUE_OFFSET in 20 bits
+
+# --- Worker process state (set by _init_worker) ---
+_shm = None
+_table = None   # memoryview of 64-bit words: slot i holds (key ^ data, data)
+_slots = 0
+_memo = {}
+
+
+def _pack(value, move, nodes):
+    return (int(value) + VALUE_OFFSET) | ((move or 0) << 20) | (nodes << 24)
+
+
+def _unpack(data):
+    move = (data >> 20) & 0xF
+    return float((data & 0xFFFFF) - VALUE_OFFSET), move or None, data >> 24
+
+
+def _table_get(key):
+    """
+    Lock-free lookup. Writers may race, so each slot stores (key ^ data, data): a slot
+    torn by two concurrent writers fails the XOR check and reads as a miss.
+    """
+    slot = (key % _slots) * 2
+    data = _table[slot + 1]
+    if _table[slot] ^ data == key and data:
+        return _unpack(data)
+    return None
+
+
+def _table_put(key, value, move, nodes):
+    data = _pack(value, move, nodes)
+    slot = (key % _slots) * 2
+    _table[slot] = key ^ data
+    _table[slot + 1] = data
+
+
+def solve_position(n, starter, other, starter_to_move, remaining):
+    """
+    Exact minimax result of a position given from the starter's point of view.
+    Returns (value, best_move, nodes) where value/best_move follow ai.minimax (tie-breaks
+    included) and nodes is the size of the full minimax tree below the position.
+    Sub-positions are shared through the canonical state key (local memo + shared table).
+    """
+    if state_key.is_terminal_number(n):
+        diff = starter - other
+        return (1000.0 + diff if diff > 0 else -1000.0 + diff if diff < 0 else 0.0), None, 1
+
+    key = state_key.full_key(n, other, starter, 1 if starter_to_move else 2, 1, remaining)
+    result = _memo.get(key)
+    if result is None and _table is not None:
+        result = _table_get(key)
+    if result is not None:
+        return result
+
+    best_value, best_move, nodes = None, None, 1
+    for divisor in (2, 3):
+        if n % divisor:
+            continue
+        child_n = n // divisor
+        pt = 1 if child_n % 2 == 0 else -1
+        if starter_to_move:
+            child = solve_position(child_n, max(0, starter + pt), other, False, remaining - 1)
+        else:
+            child = solve_position(child_n, starter, max(0, other + pt), True, remaining - 1)
+        child_value, _, child_nodes = child
+        nodes += child_nodes
+        # Same tie-breaking as minimax: MAX (starter) keeps 3 on ties, MIN keeps 2
+        if (best_value is None
+                or (starter_to_move and (child_value > best_value or child_value == best_value and divisor == 3))
+                or (not starter_to_move and child_value < best_value)):
+            best_value, best_move = child_value, divisor
+
+    result = (best_value, best_move, nodes)
+    if len(_memo) >= LOCAL_MEMO_LIMIT:
+        _memo.clear()
+    _memo[key] = result
+    if _table is not None:
+        _table_put(key, best_value, best_move, nodes)
+    return result
+
+
+def _init_worker(shm_name, slots):
+    global _shm, _table, _slots
+    _shm = shared_memory.SharedMemory(name=shm_name)
+    _table = _shm.buf.cast('Q')
+    _slots = slots
+
+
+def _solve_chunk(args):
+    """Solves every multiple of 6 in [start, stop). Returns (chunk_id, packed records)."""
+    chunk_id, start, stop = args
+    records = bytearray()
+    first = start + (-start) % 6
+    for n in range(first, stop, 6):
+        value, move, nodes = solve_position(n, 0, 0, True, state_key.remaining_depth(n))
+        outcome = (value > 0) - (value < 0)
+        records += struct.pack(RECORD_FORMAT, n, outcome, move or 0, nodes)
+    return chunk_id, bytes(records)
+
+
+def _load_checkpoint(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return None
+
+
+def _save_checkpoint(path, checkpoint):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path) # Atomic: an interrupted write never corrupts the checkpoint
+
+
+def solve_range(start, stop, output=RESULTS_FILE, chunk_size=60_000, workers=None, table_slots=DEFAULT_TABLE_SLOTS):
+    """
+    Solves every multiple of 6 in [start, stop) across a process pool and writes `output`.
+    Progress is checkpointed after each chunk; rerunning with the same arguments resumes.
+    """
+    partial_path = output + ".partial"
+    checkpoint_path = output + ".checkpoint"
+    params = {'start': start, 'stop': stop, 'chunk_size': chunk_size}
+    chunks = [(i, lo, min(lo + chunk_size, stop)) for i, lo in enumerate(range(start, stop, chunk_size))]
+
+    checkpoint = _load_checkpoint(checkpoint_path)
+    if checkpoint is None or checkpoint.get('params') != params or not os.path.exists(partial_path):
+        checkpoint = {'params': params, 'done': [], 'offset': 0}
+        open(partial_path, 'wb').close()
+    done = set(checkpoint['done'])
+    # Drop records appended after the last checkpoint (their chunk is solved again)
+    with open(partial_path, 'r+b') as f:
+        f.truncate(checkpoint['offset'])
+    pending = [chunk for chunk in chunks if chunk[0] not in done]
+    if done:
+        print(f"Resuming: {len(done)}/{len(chunks)} chunks already solved")
+
+    shm = shared_memory.SharedMemory(create=True, size=table_slots * 16)
+    shm.buf[:] = bytes(table_slots * 16) # Empty slots read as misses
+    start_time = time.perf_counter()
+    solved = 0
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(shm.name, table_slots)) as pool, \
+                open(partial_path, 'ab') as out:
+            for chunk_id, records in pool.imap_unordered(_solve_chunk, pending):
+                out.write(records)
+                out.flush()
+                os.fsync(out.fileno())
+                checkpoint['done'].append(chunk_id)
+                checkpoint['offset'] = out.tell()
+                _save_checkpoint(checkpoint_path, checkpoint)
+                solved += len(records) // RECORD_SIZE
+                elapsed = time.perf_counter() - start_time
+                print(f"Chunk {chunk_id}: {len(checkpoint['done'])}/{len(chunks)} done, "
+                      f"{solved / elapsed:,.0f} numbers/s")
+    finally:
+        shm.close()
+        shm.unlink()
+
+    _finalize(partial_path, output)
+    os.remove(partial_path)
+    os.remove(checkpoint_path)
+    return solved, time.perf_counter() - start_time
+
+
+def _finalize(partial_path, output):
+    """Sorts the solved records by n and writes the final results file."""
+    with open(partial_path, 'rb') as f:
+        data = f.read()
+    records = [data[i:i + RECORD_SIZE] for i in range(0, len(data), RECORD_SIZE)]
+    records.sort(key=lambda record: struct.unpack_from("<Q", record)[0])
+    with open(output, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, RESULTS_MAGIC, RESULTS_VERSION, len(records)))
+        f.writelines(records)
+
+
+# --- Batch Solver Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve every multiple of 6 in a range on all cores.")
+    parser.add_argument("--start", type=int, default=10000)
+    parser.add_argument("--stop", type=int, default=20001, help="Exclusive upper bound (e.g. 10000000)")
+    parser.add_argument("--chunk-size", type=int, default=60_000, help="Numbers per chunk (multiples of 6 inside)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--table-slots", type=int, default=DEFAULT_TABLE_SLOTS, help="Shared table entries")
+    parser.add_argument("--output", default=RESULTS_FILE)
+    args = parser.parse_args()
+
+    count, elapsed = solve_range(args.start, args.stop, args.output, args.chunk_size, args.workers, args.table_slots)
+    print(f"Solved {count:,} starting numbers in {elapsed:.2f}s -> {args.output}")
@@ -0,0 +1,146 @@
+import struct
+from ai import GameState, StreamingGameState
+
+# Compact binary forms of game positions. Nothing here pickles GameState objects: the eager
+# left/right subtree makes a pickled state huge, and every subtree can be rebuilt from its root.
+
+# Numbers have no upper bound, so n is stored as a length byte and that many little-endian bytes
+MAX_NUMBER_BYTES = 255
+MAX_NUMBER = 2 ** (8 * MAX_NUMBER_BYTES) - 1 # Largest n the formats below can hold
+
+# Position: a single state without its subtree (the IPC format for search workers)
+POSITION_FORMAT = "<HHHBB"    # cp, pp, b, turn (0 = none), original_turn, followed by n
+POSITION_SIZE = struct.calcsize(POSITION_FORMAT)
+
+# Snapshot: a game as its root parameters plus the move path (see Game.snapshot)
+SNAPSHOT_MAGIC = b"NDSS"
+SNAPSHOT_VERSION = 2
+# Header: magic, version, original turn, ply count, total AI time (s), total nodes, followed
+# by the initial number and two bit fields of ceil(plies / 8) bytes: divisor (1 = divided by 3), AI ply flag
+SNAPSHOT_HEADER_FORMAT = "<4sBBHdQ"
+SNAPSHOT_HEADER_SIZE = struct.calcsize(SNAPSHOT_HEADER_FORMAT)
+
+# Solved subtree: canonical key -> (value, best move) for every position below a root
+SOLVED_MAGIC = b"NDSV"
+SOLVED_VERSION = 1
+SOLVED_HEADER_FORMAT = "<4sBI"  # magic, version, entry count
+SOLVED_HEADER_SIZE = struct.calcsize(SOLVED_HEADER_FORMAT)
+SOLVED_ENTRY_FORMAT = "<QiB"    # canonical key, exact value, best move (2/3)
+SOLVED_ENTRY_SIZE = struct.calcsize(SOLVED_ENTRY_FORMAT)
+
+
+def _pack_number(n):
+    """Length-prefixed little-endian bytes of a non-negative number. Raises ValueError above MAX_NUMBER."""
+    if not 0 <= n <= MAX_NUMBER:
+        raise ValueError(f"number out of range: must be between 0 and 2^{8 * MAX_NUMBER_BYTES} - 1")
+    size = (n.bit_length() + 7) // 8
+    return bytes((size,)) + n.to_bytes(size, 'little')
+
+
+def _unpack_number(data, offset):
+    """Returns (number, offset after it) for _pack_number() bytes at `offset`."""
+    if offset >= len(data) or offset + 1 + data[offset] > len(data):
+        raise ValueError("truncated number")
+    end = offset + 1 + data[offset]
+    return int.from_bytes(data[offset + 1:end], 'little'), end
+
+
+def encode_position(state):
+    """Packs one state (without its subtree): POSITION_SIZE bytes plus the length-prefixed n."""
+    try:
+        fields = struct.pack(POSITION_FORMAT, state.cp, state.pp, state.b, state.turn or 0, state.original_turn)
+    except struct.error as e:
+        raise ValueError(f"position out of range: {e}") from e
+    return fields + _pack_number(state.n)
+
+
+def decode_position(data, state_class=GameState):
+    """
+    Rebuilds a state from encode_position() bytes. The default GameState materializes the
+    subtree again; pass StreamingGameState to get the position alone.
+    """
+    if len(data) < POSITION_SIZE:
+        raise ValueError("truncated position")
+    cp, pp, b, turn, original_turn = struct.unpack_from(POSITION_FORMAT, data)
+    n, end = _unpack_number(data, POSITION_SIZE)
+    if end != len(data):
+        raise ValueError("position has trailing bytes")
+    return state_class(n, cp, pp, b, turn or None, original_turn)
+
+
+def _pack_bits(flags):
+    bits = bytearray((len(flags) + 7) // 8)
+    for index, flag in enumerate(flags):
+        if flag:
+            bits[index >> 3] |= 1 << (index & 7)
+    return bytes(bits)
+
+
+def _unpack_bits(data, count):
+    return [bool(data[index >> 3] >> (index & 7) & 1) for index in range(count)]
+
+
+def encode_snapshot(initial_number, original_turn, divisors, ai_plies, total_ai_time=0.0, total_nodes=0):
+    """
+    Packs a game as its starting parameters and move path.
+    divisors: Moves played so far (2 or 3); ai_plies: matching flags, True for AI moves.
+    """
+    try:
+        header = struct.pack(SNAPSHOT_HEADER_FORMAT, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, original_turn,
+                             len(divisors), total_ai_time, total_nodes)
+    except struct.error as e:
+        raise ValueError(f"game out of range for a snapshot: {e}") from e
+    return header + _pack_number(initial_number) + _pack_bits([d == 3 for d in divisors]) + _pack_bits(ai_plies)
+
+
+def decode_snapshot(data):
+    """Returns (initial_number, original_turn, divisors, ai_plies, total_ai_time, total_nodes)."""
+    if len(data) < SNAPSHOT_HEADER_SIZE:
+        raise ValueError("truncated game snapshot")
+    magic, version, original_turn, plies, total_ai_time, total_nodes = \
+        struct.unpack_from(SNAPSHOT_HEADER_FORMAT, data)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"not a version {SNAPSHOT_VERSION} game snapshot")
+    initial_number, offset = _unpack_number(data, SNAPSHOT_HEADER_SIZE)
+    field_size = (plies + 7) // 8
+    if len(data) != offset + 2 * field_size:
+        raise ValueError("game snapshot has the wrong length for its ply count")
+    path_bits = data[offset:offset + field_size]
+    ai_bits = data[offset + field_size:]
+    divisors = [3 if bit else 2 for bit in _unpack_bits(path_bits, plies)]
+    return initial_number, original_turn, divisors, _unpack_bits(ai_bits, plies), total_ai_time, total_nodes
+
+
+def replay(initial_number, original_turn, divisors):
+    """
+    Plays the move path from the starting number without building any subtree.
+    Returns the StreamingGameState reached after each move (empty list for no moves).
+    Raises ValueError on a move that is not legal in the position it is played from.
+    """
+    state = StreamingGameState(initial_number, 0, 0, 0, original_turn, original_turn)
+    states = []
+    for divisor in divisors:
+        child = state.left if divisor == 2 else state.right if divisor == 3 else None
+        if child is None:
+            raise ValueError(f"illegal move in snapshot: cannot divide {state.n} by {divisor}")
+        state = child
+        states.append(state)
+    return states
+
+
+def pack_solutions(solutions):
+    """Packs a canonical key -> (value, best move) mapping (e.g. from ai.solve_tree) sorted by key."""
+    entries = [struct.pack(SOLVED_ENTRY_FORMAT, key, int(value), move)
+               for key, (value, move) in sorted(solutions.items())]
+    return struct.pack(SOLVED_HEADER_FORMAT, SOLVED_MAGIC, SOLVED_VERSION, len(entries)) + b"".join(entries)
+
+
+def unpack_solutions(data):
+    """Inverse of pack_solutions. Values come back as floats, like the search functions return."""
+    magic, version, count = struct.unpack_from(SOLVED_HEADER_FORMAT, data)
+    if magic != SOLVED_MAGIC or version != SOLVED_VERSION:
+        raise ValueError(f"not a version {SOLVED_VERSION} solved subtree")
+    if len(data) != SOLVED_HEADER_SIZE + count * SOLVED_ENTRY_SIZE:
+        raise ValueError("solved subtree has the wrong length for its entry count")
+    return {key: (float(value), move)
+            for key, value, move in struct.iter_unpack(SOLVED_ENTRY_FORMAT, data[SOLVED_HEADER_SIZE:])}
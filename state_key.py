@@ -0,0 +1,133 @@
+import os
+import random
+
+KEY_MASK = (1 << 64) - 1
+TABLE_SIZE = 64 # Score values with a dedicated random entry; larger ones are hashed
+# Set NDG_KEY_DEBUG=1 to check every key against its canonical tuple and catch collisions
+DEBUG_COLLISIONS = os.environ.get("NDG_KEY_DEBUG") == "1"
+
+# Zobrist tables: fixed seed, so keys are stable across runs and can be persisted
+_rng = random.Random(0x4E4447)
+_STARTER_SCORE = [_rng.getrandbits(64) for _ in range(TABLE_SIZE)]
+_OTHER_SCORE = [_rng.getrandbits(64) for _ in range(TABLE_SIZE)]
+_DIFF = [_rng.getrandbits(64) for _ in range(2 * TABLE_SIZE + 1)] # Indexed by diff + TABLE_SIZE
+_STARTER_TO_MOVE = _rng.getrandbits(64)
+_SALT_STARTER, _SALT_OTHER, _SALT_DIFF = (_rng.getrandbits(64) for _ in range(3))
+
+_seen_keys = {} # key -> canonical tuple, only filled in debug mode
+
+
+def _mix(x):
+    """splitmix64 finalizer: spreads an integer over 64 bits."""
+    x = (x + 0x9E3779B97F4A7C15) & KEY_MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & KEY_MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & KEY_MASK
+    return x ^ (x >> 31)
+
+
+def _n_part(n):
+    """Multiplicative (Fibonacci) hash of n: one multiply, and a bijection on 64-bit n."""
+    return (n * 0x9E3779B97F4A7C15) & KEY_MASK
+
+
+def _entry(table, salt, index):
+    """Table entry for small values, hashed entry for values beyond the table."""
+    return table[index] if 0 <= index < len(table) else _mix(index ^ salt)
+
+
+def is_terminal_number(n):
+    """True if no move is possible from n (same rule as GameState)."""
+    return not (n > 3 and (n % 2 == 0 or n % 3 == 0))
+
+
+def remaining_depth(n):
+    """Upper bound on the moves left from n: every move removes one factor 2 or 3."""
+    depth = 0
+    while n > 3 and n % 2 == 0:
+        n //= 2
+        depth += 1
+    while n > 3 and n % 3 == 0:
+        n //= 3
+        depth += 1
+    return depth
+
+
+def canonical(n, starter_score, other_score, starter_to_move, remaining):
+    """
+    Canonical form of a position for value lookups.
+    - Scores are taken from the starter's point of view, so either player label may start.
+    - The bank is left out: the heuristic ignores it.
+    - Scores reduce to their difference when neither can hit the 0 floor before the end
+      (both are at least the number of moves left); terminal states always reduce.
+    - Terminal states have no player to move.
+    """
+    if is_terminal_number(n):
+        return (n, starter_score - other_score, None)
+    if min(starter_score, other_score) >= remaining:
+        return (n, starter_score - other_score, starter_to_move)
+    return (n, starter_score, other_score, starter_to_move)
+
+
+def _score_part(n, starter_score, other_score, remaining):
+    if is_terminal_number(n) or min(starter_score, other_score) >= remaining:
+        return _entry(_DIFF, _SALT_DIFF, starter_score - other_score + TABLE_SIZE)
+    return (_entry(_STARTER_SCORE, _SALT_STARTER, starter_score)
+            ^ _entry(_OTHER_SCORE, _SALT_OTHER, other_score))
+
+
+def _mover_part(n, starter_to_move):
+    return _STARTER_TO_MOVE if starter_to_move and not is_terminal_number(n) else 0
+
+
+def _scores(cp, pp, original_turn):
+    """(starter_score, other_score) for raw cp/pp."""
+    return (pp, cp) if original_turn == 1 else (cp, pp)
+
+
+def full_key(n, cp, pp, turn, original_turn, remaining=None):
+    """Computes the 64-bit canonical key of a position from scratch."""
+    if remaining is None:
+        remaining = remaining_depth(n)
+    starter_score, other_score = _scores(cp, pp, original_turn)
+    starter_to_move = turn == original_turn
+    key = _n_part(n) ^ _score_part(n, starter_score, other_score, remaining) ^ _mover_part(n, starter_to_move)
+    if DEBUG_COLLISIONS:
+        _check(key, canonical(n, starter_score, other_score, starter_to_move, remaining))
+    return key
+
+
+def child_key(parent, new_n, new_cp, new_pp, new_turn):
+    """
+    Key of a child of `parent` (a GameState). Every move changes n, the mover and one score,
+    so nothing of the parent's key survives an XOR update; instead the child reuses the
+    parent's remaining-depth bound (one less) and never factors n again.
+    """
+    new_remaining = parent.remaining - 1
+    if parent.original_turn == 1:
+        starter_score, other_score = new_pp, new_cp
+    else:
+        starter_score, other_score = new_cp, new_pp
+    key = (new_n * 0x9E3779B97F4A7C15) & KEY_MASK # Same as _n_part, inlined for speed
+    if new_n <= 3 or (new_n % 2 and new_n % 3):
+        # Terminal: value depends on the score difference only and nobody moves
+        key ^= _entry(_DIFF, _SALT_DIFF, starter_score - other_score + TABLE_SIZE)
+    else:
+        if starter_score >= new_remaining and other_score >= new_remaining:
+            key ^= _entry(_DIFF, _SALT_DIFF, starter_score - other_score + TABLE_SIZE)
+        else:
+            key ^= (_entry(_STARTER_SCORE, _SALT_STARTER, starter_score)
+                    ^ _entry(_OTHER_SCORE, _SALT_OTHER, other_score))
+        if new_turn == parent.original_turn:
+            key ^= _STARTER_TO_MOVE
+    if DEBUG_COLLISIONS:
+        expected = full_key(new_n, new_cp, new_pp, new_turn, parent.original_turn, new_remaining)
+        if key != expected:
+            raise RuntimeError(f"Child key mismatch for n={new_n}: {key:#x} != {expected:#x}")
+    return key
+
+
+def _check(key, canonical_form):
+    """Debug mode: raises if two different canonical positions share a key."""
+    seen = _seen_keys.setdefault(key, canonical_form)
+    if seen != canonical_form:
+        raise RuntimeError(f"State key collision {key:#x}: {seen} vs {canonical_form}")
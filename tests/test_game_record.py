@@ -0,0 +1,46 @@
+import struct
+import pytest
+from game_logic import Game
+from game_record import RecordReader, V1_HEADER_FORMAT, PLY_FIELDS_FORMAT, RECORD_MAGIC
+
+
+def _play(number):
+    game = Game({'mode': 'AI', 'algorithm': 'alphabeta', 'starting_player': 'ai', 'verbose': False})
+    game.select_number(number)
+    while not game.current_state.terminal():
+        game.computer_move()
+    return game
+
+
+@pytest.mark.parametrize("number", [10008, 2 ** 70 * 3])
+def test_save_and_seek(tmp_path, number):
+    game = _play(number)
+    path = game.save_record(str(tmp_path))
+    assert path is not None
+    with RecordReader(path) as reader:
+        assert reader.initial_number == number and reader.algorithm == 'alphabeta'
+        assert list(reader) == game.record.plies
+        last = len(reader) - 1
+        assert reader.seek_ply(last) == game.record.plies[last]
+        state = reader.state_before(last)
+        assert state.n == game.record.plies[last - 1].n
+
+
+def test_reads_version_1(tmp_path):
+    path = tmp_path / "old.ndgr"
+    plies = [(2, 5004, 0, 1, 0, 2, 1, 0.5, 34), (3, 1668, 1, 1, 0, 0, 0, 0.0, 0)]
+    data = struct.pack(V1_HEADER_FORMAT, RECORD_MAGIC, 1, 10008, 1, b"AI", b"alphabeta", len(plies))
+    for ply in plies:
+        data += struct.pack("<BQ", *ply[:2]) + struct.pack(PLY_FIELDS_FORMAT, *ply[2:])
+    path.write_bytes(data)
+    with RecordReader(str(path)) as reader:
+        assert reader.initial_number == 10008 and reader.mode == 'AI'
+        assert [tuple(ply) for ply in reader] == plies
+
+
+def test_rejects_bad_files(tmp_path):
+    for name, data in (("empty", b""), ("magic", b"XXXX\x02" + bytes(40)), ("short", RECORD_MAGIC + b"\x02\x01")):
+        path = tmp_path / name
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            RecordReader(str(path))
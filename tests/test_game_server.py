@@ -0,0 +1,104 @@
+import json
+import asyncio
+from game_server import GameServer, MAX_GAME_MOVES
+from state_codec import MAX_NUMBER
+
+
+async def _session(requests, **options):
+    """Plays `requests` on one connection to a fresh server and returns its replies."""
+    server = GameServer(max_workers=1, **options)
+    listener = await server.start(host="127.0.0.1", port=0)
+    try:
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = []
+        for request in requests:
+            writer.write((request if isinstance(request, bytes) else json.dumps(request).encode()) + b"\n")
+            await writer.drain()
+            replies.append(json.loads(await reader.readline()))
+        writer.write(json.dumps({'op': 'quit'}).encode() + b"\n") # Let the session end before the server does
+        await reader.readline()
+        writer.close()
+        await writer.wait_closed()
+        return replies
+    finally:
+        listener.close()
+        await listener.wait_closed()
+        server.close()
+
+
+def test_bad_requests_get_error_replies():
+    replies = asyncio.run(_session([
+        {'op': 'new', 'number': 10008, 'algorithm': 'bogus'},
+        {'op': 'new', 'number': 0},
+        {'op': 'new', 'number': MAX_NUMBER + 1},
+        {'op': 'new'},
+        {'op': 'move', 'divisor': 2},
+        {'op': 'fly'},
+        b"not json",
+        [1, 2],
+    ]))
+    assert all(reply['ok'] is False and reply['error'] for reply in replies)
+    assert "unknown algorithm" in replies[0]['error']
+    assert "number must be between" in replies[1]['error']
+    assert "number must be between" in replies[2]['error']
+    assert "no game" in replies[4]['error']
+
+
+def test_numbers_too_deep_to_build_are_refused():
+    replies = asyncio.run(_session([
+        {'op': 'new', 'number': 2 ** 200},
+        {'op': 'new', 'number': 2 ** 300},
+        {'op': 'new', 'number': 2 ** MAX_GAME_MOVES},
+        {'op': 'new', 'number': 7 * 2 ** 2000}, # In codec range, far too deep
+    ]))
+    assert not replies[0]['ok'] and "moves" in replies[0]['error']
+    assert not replies[1]['ok'] and "moves" in replies[1]['error']
+    assert replies[2]['ok']
+    assert not replies[3]['ok']
+
+
+def test_session_survives_errors():
+    replies = asyncio.run(_session([
+        {'op': 'new', 'number': 2 ** 70 * 3},     # Beyond 64 bits: still a valid game
+        {'op': 'move', 'divisor': 5},
+        {'op': 'new', 'number': 10008, 'algorithm': 'alphabeta'},
+        {'op': 'move', 'divisor': 2},
+        {'op': 'ai'},
+        {'op': 'stats'},
+    ]))
+    assert replies[0]['ok'] and replies[0]['state']['n'] == 2 ** 70 * 3
+    assert not replies[1]['ok']
+    assert replies[3]['ok'] and replies[3]['state']['n'] == 5004
+    assert replies[4]['ok'] and replies[4]['divisor'] in (2, 3)
+    # The search seeds the shared cache with the positions it proved, not just the root
+    assert replies[5]['searches'] == 1 and replies[5]['cached_positions'] > 1
+
+
+def test_deep_number_stays_within_budget():
+    # Far too many states to build: the worker streams the tree and deepens under the node budget
+    replies = asyncio.run(_session([
+        {'op': 'new', 'number': 2 ** 40 * 3 ** 30 * 5, 'algorithm': 'alphabeta', 'starting_player': 'ai'},
+        {'op': 'ai'},
+        {'op': 'stats'},
+    ]))
+    assert replies[1]['ok'] and replies[1]['divisor'] in (2, 3)
+    # The budgeted result is an estimate, so nothing was cached as solved
+    assert replies[2]['searches'] == 1 and replies[2]['cached_positions'] == 0
+
+
+def test_auto_estimates_are_not_cached():
+    deep = {'op': 'new', 'number': 2 ** 40 * 3 ** 30 * 5, 'algorithm': 'auto', 'starting_player': 'ai'}
+    replies = asyncio.run(_session([deep, {'op': 'ai'}, deep, {'op': 'ai'}, {'op': 'stats'}]))
+    # Too big for exact alpha-beta: the deepening estimate is searched again, not served as solved
+    assert replies[1]['ok'] and not replies[1]['cached']
+    assert replies[3]['ok'] and not replies[3]['cached']
+    assert replies[4]['searches'] == 2 and replies[4]['cached_positions'] == 0
+
+
+def test_selection_log(tmp_path):
+    path = tmp_path / "selection.jsonl"
+    asyncio.run(_session([{'op': 'new', 'number': 10008, 'algorithm': 'auto', 'starting_player': 'ai'},
+                          {'op': 'ai'}], selection_log=str(path)))
+    entry = json.loads(path.read_text().splitlines()[0])
+    assert entry['n'] == 10008 and entry['engine'] in ('table', 'alphabeta')
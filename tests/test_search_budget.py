@@ -0,0 +1,69 @@
+import math
+from ai import StatePool, SearchBudget, alphabeta, minimax, solve_tree
+from engine_select import iterative_deepening
+from game_logic import Game, DEFAULT_SEARCH_NODES, DEFAULT_STREAMING_SEARCH_NODES
+from solution_cache import SolutionCache
+
+
+def _root(n):
+    return StatePool().intern(n, 0, 0, 0, 1, 1)
+
+
+def test_unlimited_deepening_is_exact():
+    state = _root(2 ** 6 * 3 ** 5 * 7)
+    value, move, _, depth = iterative_deepening(state, True)
+    assert depth >= state.remaining
+    assert (value, move) == minimax(state, True)[:2]
+
+
+def test_cut_iteration_is_discarded():
+    state = _root(2 ** 9 * 3 ** 7 * 25)
+    budget = SearchBudget(2_000)
+    value, move, _, depth = iterative_deepening(state, True, budget=budget)
+    assert budget.exhausted and 1 <= depth < state.remaining
+    # The result is that of the deepest iteration that completed, not of the one cut short
+    assert (value, move) == alphabeta(state, -math.inf, math.inf, True, depth)[:2]
+
+
+def test_search_records_only_exact_solutions():
+    state = _root(2 ** 8 * 3 ** 6 * 5)
+    expected = solve_tree(state)
+    for search in (lambda s: minimax(state, True, solutions=s),
+                   lambda s: alphabeta(state, -math.inf, math.inf, True, solutions=s)):
+        solutions = {}
+        search(solutions)
+        assert solutions and all(expected[key] == entry for key, entry in solutions.items())
+    # A depth-limited search proves nothing; a budgeted one only what it solved before the cut-off
+    solutions = {}
+    alphabeta(state, -math.inf, math.inf, True, depth=3, solutions=solutions)
+    assert not solutions
+    minimax(state, True, budget=SearchBudget(100), solutions=solutions)
+    assert state.key not in solutions and all(expected[key] == entry for key, entry in solutions.items())
+
+
+def _game(**settings):
+    return Game(dict({'mode': 'AI', 'algorithm': 'alphabeta', 'starting_player': 'ai', 'verbose': False}, **settings),
+                solution_cache=SolutionCache(None, max_entries=1_000))
+
+
+def test_default_node_budgets():
+    game = _game()
+    game.select_number(10008)
+    assert not game.streaming and game.effective_search_budget() == DEFAULT_SEARCH_NODES
+    assert _game(search_node_budget=0).effective_search_budget() is None
+    assert _game(search_node_budget=123).effective_search_budget() == 123
+    streaming = _game(max_tree_states=10)
+    streaming.select_number(10008)
+    assert streaming.streaming and streaming.effective_search_budget() == DEFAULT_STREAMING_SEARCH_NODES
+
+
+def test_streaming_shrinks_the_cache_once():
+    game = _game(max_tree_states=10)
+    cache = game.solution_cache
+    for i in range(1_000):
+        cache.put(i, 0, 2)
+    game.select_number(10008)
+    assert game.streaming and len(cache) == 500 and cache.max_entries == 1_000
+    while game.current_state is not None and not game.current_state.terminal():
+        game.computer_move() # Searching while streaming does not shrink it again
+    assert len(cache) >= 500 and cache.max_entries == 1_000
@@ -0,0 +1,45 @@
+import json
+from solution_cache import SolutionCache, CACHE_VERSION
+
+
+def test_flush_and_reload(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = SolutionCache(path)
+    cache.put("a", 1001, 3)
+    cache.put("b", -1002, 2)
+    cache.flush()
+    reloaded = SolutionCache(path)
+    assert reloaded.get("a") == (1001, 3) and reloaded.get("b") == (-1002, 2)
+
+
+def test_stale_version_loads_empty(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps({'version': CACHE_VERSION - 1, 'entries': [["a", 1001, 3]]}))
+    cache = SolutionCache(str(path))
+    assert cache.get("a") is None and len(cache) == 0
+
+
+def test_corrupt_file_loads_empty(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+    assert len(SolutionCache(str(path))) == 0
+
+
+def test_lru_eviction():
+    cache = SolutionCache(None, max_entries=2)
+    cache.put("a", 1, 2)
+    cache.put("b", 2, 2)
+    cache.get("a") # Now "b" is the least recently used
+    cache.put("c", 3, 3)
+    assert cache.get("b") is None and cache.get("a") == (1, 2) and cache.get("c") == (3, 3)
+
+
+def test_shrink_keeps_capacity():
+    cache = SolutionCache(None, max_entries=100)
+    for i in range(100):
+        cache.put(i, i, 2)
+    cache.shrink(0.5)
+    assert len(cache) == 50 and cache.max_entries == 100
+    for i in range(100, 200):
+        cache.put(i, i, 2)
+    assert len(cache) == 100 # Grows back to the full size
@@ -0,0 +1,48 @@
+import pytest
+from ai import StreamingGameState
+from state_codec import (MAX_NUMBER, encode_position, decode_position, encode_snapshot, decode_snapshot,
+                         pack_solutions, unpack_solutions)
+
+
+@pytest.mark.parametrize("n", [1, 4, 10008, 2 ** 64 - 1, 2 ** 64, 2 ** 70, MAX_NUMBER])
+def test_position_round_trip(n):
+    state = StreamingGameState(n, 3, 5, 1, 2 if n > 3 else None, 1)
+    decoded = decode_position(encode_position(state), StreamingGameState)
+    assert (decoded.n, decoded.cp, decoded.pp, decoded.b, decoded.turn, decoded.original_turn) == \
+        (state.n, state.cp, state.pp, state.b, state.turn, state.original_turn)
+
+
+def test_position_out_of_range():
+    with pytest.raises(ValueError):
+        encode_position(StreamingGameState(MAX_NUMBER + 1, 0, 0, 0, 1, 1))
+    with pytest.raises(ValueError):
+        encode_position(StreamingGameState(10008, 70_000, 0, 0, 1, 1)) # Scores are 16-bit
+
+
+def test_position_malformed():
+    data = encode_position(StreamingGameState(10008, 0, 0, 0, 1, 1))
+    for bad in (b"", data[:-1], data + b"\0"):
+        with pytest.raises(ValueError):
+            decode_position(bad, StreamingGameState)
+
+
+@pytest.mark.parametrize("n", [10008, 2 ** 70 * 3])
+def test_snapshot_round_trip(n):
+    divisors = [2, 3, 3, 2, 2, 3, 2, 2, 3]
+    ai_plies = [i % 2 == 1 for i in range(len(divisors))]
+    data = encode_snapshot(n, 2, divisors, ai_plies, 1.5, 12345)
+    assert decode_snapshot(data) == (n, 2, divisors, ai_plies, 1.5, 12345)
+
+
+def test_snapshot_malformed():
+    data = encode_snapshot(10008, 1, [2, 3], [False, True])
+    for bad in (data[:5], b"XXXX" + data[4:], data[:-1], data + b"\0"):
+        with pytest.raises(ValueError):
+            decode_snapshot(bad)
+    with pytest.raises(ValueError):
+        encode_snapshot(MAX_NUMBER + 1, 1, [], [])
+
+
+def test_solutions_round_trip():
+    solutions = {12345: (1003, 3), 2 ** 63: (-1001, 2)}
+    assert unpack_solutions(pack_solutions(solutions)) == solutions
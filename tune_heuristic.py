@@ -0,0 +1,74 @@
+import json
+import math
+import random
+import argparse
+import numpy as np
+import ai
+from ai import GameState, alphabeta, STATIC_WEIGHTS, EVALUATION_LIMIT, HEURISTIC_WEIGHTS_FILE
+from batch_eval import evaluate_positions
+
+FEATURE_NAMES = list(STATIC_WEIGHTS) # Same order as the weights dictionary
+
+
+def sample_positions(count, rng, max_n=200000, max_score=6):
+    """Random non-terminal positions, biased towards the deep multiples of 6 the game starts from."""
+    positions = []
+    while len(positions) < count:
+        n = rng.randint(4, max_n)
+        if rng.random() < 0.7:
+            n -= n % 6
+        if n <= 3 or (n % 2 and n % 3):
+            continue # Terminal: nothing to estimate
+        orig = rng.choice((1, 2))
+        positions.append((n, rng.randint(0, max_score), rng.randint(0, max_score), rng.choice((1, 2)), orig))
+    return positions
+
+
+def fit_weights(positions):
+    """
+    Least-squares fit of the evaluator weights to exact solver values.
+    Targets are the exact values clamped to the evaluator's range, so wins/losses pull
+    towards +-EVALUATION_LIMIT and draws towards 0.
+    """
+    values, _ = evaluate_positions(*zip(*positions))
+    targets = np.clip(values, -EVALUATION_LIMIT, EVALUATION_LIMIT)
+    features = np.array([
+        [GameState(n, cp, pp, 0, turn, orig).features()[name] for name in FEATURE_NAMES]
+        for n, cp, pp, turn, orig in positions
+    ])
+    solution, _, _, _ = np.linalg.lstsq(features, targets, rcond=None)
+    rmse = float(np.sqrt(np.mean((features @ solution - targets) ** 2)))
+    return dict(zip(FEATURE_NAMES, map(float, solution))), rmse
+
+
+def move_agreement(positions, depth, mode):
+    """Fraction of positions where depth-limited alpha-beta picks the exact best move."""
+    _, exact_moves = evaluate_positions(*zip(*positions))
+    agree = 0
+    for (n, cp, pp, turn, orig), exact_move in zip(positions, exact_moves):
+        state = GameState(n, cp, pp, 0, turn, orig)
+        _, move, _ = alphabeta(state, -math.inf, math.inf, turn == orig, depth, mode)
+        agree += move == exact_move
+    return agree / len(positions)
+
+
+# --- Offline Tuning Entry Point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the tuned heuristic weights from exact solver results.")
+    parser.add_argument("--samples", type=int, default=20000, help="Training positions")
+    parser.add_argument("--test", type=int, default=2000, help="Held-out positions for the move-agreement check")
+    parser.add_argument("--depth", type=int, default=2, help="Search depth used for the agreement check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    weights, rmse = fit_weights(sample_positions(args.samples, rng))
+    with open(HEURISTIC_WEIGHTS_FILE, 'w') as f:
+        json.dump({'weights': weights, 'samples': args.samples, 'rmse': rmse}, f, indent=4)
+    print(f"Fitted on {args.samples:,} positions (RMSE {rmse:.1f}): {weights}")
+
+    ai._weights_by_mode.pop('tuned', None) # Reload the file just written
+    held_out = sample_positions(args.test, rng)
+    for mode in ('static', 'tuned'):
+        print(f"Depth-{args.depth} move agreement with exact solver ({mode}): "
+              f"{move_agreement(held_out, args.depth, mode):.1%}")